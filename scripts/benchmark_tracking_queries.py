@@ -0,0 +1,131 @@
+"""
+Benchmark the LongitudinalTracker hot queries with and without indexes
+
+Seeds a tracking database created at schema version 1 (the base tables,
+without indexes or the later baseline and packed-vector tables) with
+synthetic users, assessments, features and alerts, times each query, then
+migrates it to the current version and times the queries again.
+
+Usage:
+    python scripts/benchmark_tracking_queries.py --users 10000 --assessments 100
+    python scripts/benchmark_tracking_queries.py --users 100 --assessments 100 --features 100
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.tracking.longitudinal_tracker import LongitudinalTracker
+
+FEATURES = ['hesitation_ratio', 'speech_rate_wpm', 'word_finding_difficulty_count',
+            'acoustic_vocal_stability', 'pause_count', 'pitch_mean', 'pitch_std', 'lexical_diversity']
+
+def feature_names(n_features):
+    """The first n_features of FEATURES, padded with generic names"""
+    return (FEATURES + [f"feature_{i}" for i in range(len(FEATURES), n_features)])[:n_features]
+
+def seed(tracker, n_users, n_assessments, features=FEATURES, seed_value=42):
+    """Bulk insert synthetic data directly, bypassing the per-assessment logic"""
+    rng = random.Random(seed_value)
+    now = datetime.now()
+    with tracker.transaction() as conn:
+        conn.executemany("INSERT INTO users (user_id, name) VALUES (?, ?)",
+                         ((f"user{u}", f"User {u}") for u in range(n_users)))
+        for u in range(n_users):
+            user_id = f"user{u}"
+            assessments, values, alerts = [], [], []
+            for a in range(n_assessments):
+                assessment_id = f"{user_id}_{a}"
+                timestamp = (now - timedelta(days=180 * (1 - a / n_assessments))).isoformat()
+                assessments.append((assessment_id, user_id, 0, timestamp, None, None, rng.random()))
+                values.extend((assessment_id, name, rng.gauss(1.0, 0.2)) for name in features)
+                if rng.random() < 0.05:
+                    alerts.append((user_id, assessment_id, rng.choice(features),
+                                   rng.gauss(0, 1), rng.randint(1, 3), timestamp))
+            conn.executemany('''
+            INSERT INTO assessments
+                (assessment_id, user_id, task_type, timestamp, audio_path, transcript, risk_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', assessments)
+            conn.executemany('''
+            INSERT INTO assessment_features (assessment_id, feature_name, feature_value)
+            VALUES (?, ?, ?)
+            ''', values)
+            conn.executemany('''
+            INSERT INTO alerts (user_id, assessment_id, feature_name, deviation_value, severity, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', alerts)
+
+def time_queries(tracker, user_ids, repeats):
+    """Mean seconds per call for each hot query the tracker's schema supports"""
+    def update_baseline(user_id):
+        with tracker.transaction() as conn:
+            tracker._update_user_baseline(conn.cursor(), user_id)
+
+    queries = {
+        'get_user_history': lambda u: tracker.get_user_history(u),
+        'get_user_baselines': lambda u: tracker.get_user_baselines(u),
+        'get_alerts(user)': lambda u: tracker.get_alerts(u, days=30),
+        'get_alerts(all, 7d, sev>=3)': lambda u: tracker.get_alerts(days=7, severity=3),
+        # The rebuild read: the full scan _update_user_baseline did at version 1
+        '_load_recent_values': lambda u: tracker._load_recent_values(tracker.db.connection().cursor(), u),
+    }
+    if tracker.db.schema_version() == len(tracker._migrations()):
+        queries['_update_user_baseline'] = update_baseline  # Needs the baseline windows
+    results = {}
+    for name, query in queries.items():
+        start = time.perf_counter()
+        for user_id in user_ids[:repeats]:
+            query(user_id)
+        results[name] = (time.perf_counter() - start) / repeats
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tracking database queries")
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--assessments', type=int, default=100, help="Assessments per user")
+    parser.add_argument('--features', type=int, default=len(FEATURES), help="Features per assessment")
+    parser.add_argument('--repeats', type=int, default=20, help="Users sampled per query")
+    parser.add_argument('--db', help="Database path (default: a temporary file)")
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else Path(tempfile.mkdtemp()) / "benchmark.db"
+    if db_path.exists():
+        parser.error(f"{db_path} exists; the benchmark needs a new database")
+    tracker = LongitudinalTracker(db_path, schema_version=1)
+
+    print(f"Seeding {args.users} users x {args.assessments} assessments x {args.features} features "
+          f"into {db_path}...")
+    start = time.perf_counter()
+    seed(tracker, args.users, args.assessments, feature_names(args.features))
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+    user_ids = random.Random(0).sample([f"user{u}" for u in range(args.users)],
+                                       min(args.repeats, args.users))
+
+    print(f"Timing queries at schema version {tracker.db.schema_version()}...")
+    before = time_queries(tracker, user_ids, len(user_ids))
+
+    tracker.close()
+    start = time.perf_counter()
+    tracker = LongitudinalTracker(db_path)
+    version = tracker.db.schema_version()
+    print(f"Migrated to schema version {version} in {time.perf_counter() - start:.1f}s")
+    after = time_queries(tracker, user_ids, len(user_ids))
+
+    print(f"\n{'query':<30}{'v1 (ms)':>12}{f'v{version} (ms)':>12}{'speedup':>10}")
+    for name in after:
+        if name in before:
+            print(f"{name:<30}{before[name] * 1e3:>12.2f}{after[name] * 1e3:>12.2f}"
+                  f"{before[name] / after[name]:>9.0f}x")
+        else:
+            print(f"{name:<30}{'-':>12}{after[name] * 1e3:>12.2f}{'-':>10}")
+    tracker.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+import librosa
+from src.pitch_estimators import PITCH_ESTIMATORS, get_pitch_estimator
+
+def compare_estimators(y, sr, reference='pyin', estimators=None):
+    """
+    Run every pitch backend on one signal and score it against the reference
+
+    Returns one row per estimator with its runtime, voicing agreement with the
+    reference, gross pitch error rate (frames more than 20% off) and the mean
+    absolute error in cents over frames both consider voiced.
+    """
+    estimators = estimators or list(PITCH_ESTIMATORS)
+    tracks, timings = {}, {}
+    for name in dict.fromkeys([reference] + list(estimators)):
+        start = time.perf_counter()
+        tracks[name] = get_pitch_estimator(name).estimate(y, sr)
+        timings[name] = time.perf_counter() - start
+
+    ref = tracks[reference]
+    rows = []
+    for name in estimators:
+        f0 = tracks[name]
+        n = min(len(f0), len(ref))
+        est, truth = f0[:n], ref[:n]
+        est_voiced, ref_voiced = ~np.isnan(est), ~np.isnan(truth)
+        both = est_voiced & ref_voiced
+
+        if both.any():
+            ratio = est[both] / truth[both]
+            gross_error_rate = np.mean(np.abs(ratio - 1) > 0.2)
+            cents_error = np.mean(np.abs(1200 * np.log2(ratio)))
+        else:
+            gross_error_rate = cents_error = np.nan
+
+        rows.append({
+            'estimator': name,
+            'seconds': timings[name],
+            'speedup': timings[reference] / timings[name] if timings[name] > 0 else np.nan,
+            'voicing_agreement': np.mean(est_voiced == ref_voiced) if n else np.nan,
+            'gross_error_rate': gross_error_rate,
+            'mean_abs_cents': cents_error
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pitch estimators for accuracy and speed")
+    parser.add_argument('--samples-dir', default=os.path.join('data', 'raw_samples'))
+    parser.add_argument('--reference', choices=list(PITCH_ESTIMATORS), default='pyin')
+    parser.add_argument('--sample-rate', type=int, default=16000)
+    parser.add_argument('--output', help="Optional CSV path for per-file results")
+    args = parser.parse_args()
+
+    audio_files = sorted(os.path.join(args.samples_dir, f) for f in os.listdir(args.samples_dir)
+                         if f.endswith(('.wav', '.mp3')))
+    if not audio_files:
+        print(f"No audio files found in {args.samples_dir}")
+        return
+
+    results = []
+    for audio_file in audio_files:
+        print(f"Comparing pitch estimators on {audio_file}...")
+        y, sr = librosa.load(audio_file, sr=args.sample_rate)
+        for row in compare_estimators(y, sr, reference=args.reference):
+            row['file_name'] = os.path.basename(audio_file)
+            results.append(row)
+
+    results_df = pd.DataFrame(results)
+    if args.output:
+        results_df.to_csv(args.output, index=False)
+
+    summary = results_df.groupby('estimator')[
+        ['seconds', 'speedup', 'voicing_agreement', 'gross_error_rate', 'mean_abs_cents']].mean()
+    print(f"\nMean over {len(audio_files)} files (reference: {args.reference}):")
+    print(summary.round(3).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-from src.audio_processor import preprocess_audio
-from src.transcriber import transcribe_audio
-from src.feature_extractor import extract_features
+from src.batch_runner import run_batch
+from src.feature_cache import FeatureCache
+from src.pitch_estimators import PITCH_ESTIMATORS
+from src.transcription import TRANSCRIPTION_BACKENDS
 from src.ml_analyzer import analyze_features
 from src.report_generator import generate_report
+from src.plot_renderer import render_plots
 
-def main():
+def main(pitch_estimator='pyin', workers=None, save_audio=True, transcription_backend='google',
+         render=True):
     # Define paths
     raw_data_dir = os.path.join('data', 'raw_samples')
     processed_data_dir = os.path.join('data', 'processed_data')
@@ -17,37 +22,47 @@ def main():
     os.makedirs(processed_data_dir, exist_ok=True)
     os.makedirs(os.path.dirname(report_path), exist_ok=True)
     
-    # Process each audio file
-    audio_files = [os.path.join(raw_data_dir, f) for f in os.listdir(raw_data_dir) 
-                  if f.endswith(('.wav', '.mp3'))]
+    # Process each audio file (skipping files whose outputs are already current)
+    audio_files = sorted(os.path.join(raw_data_dir, f) for f in os.listdir(raw_data_dir)
+                         if f.endswith(('.wav', '.mp3')))
     
-    all_features = []
-    
-    for audio_file in audio_files:
-        print(f"Processing {audio_file}...")
-        
-        # Step 1: Preprocess audio
-        processed_audio = preprocess_audio(audio_file)
-        
-        # Step 2: Transcribe audio
-        transcript = transcribe_audio(processed_audio)
-        
-        # Step 3: Extract features
-        features = extract_features(processed_audio, transcript)
-        features['file_name'] = os.path.basename(audio_file)
-        all_features.append(features)
+    feature_cache = FeatureCache()
+    features_df = run_batch(audio_files, os.path.join(processed_data_dir, 'features'),
+                            workers=workers, pitch_estimator=pitch_estimator, cache=feature_cache,
+                            save_audio=save_audio, transcription_backend=transcription_backend)
     
     # Combine all features into a dataframe
-    features_df = pd.DataFrame(all_features)
     features_df.to_csv(os.path.join(processed_data_dir, 'all_features.csv'), index=False)
+    print(f"Feature cache: {feature_cache.stats()}")
     
     # Step 4: Analyze features with ML
     results = analyze_features(features_df)
     
-    # Step 5: Generate report
-    generate_report(results, report_path)
+    # Step 5: Generate report, rendering plots in a worker process meanwhile
+    if render:
+        plots_dir = os.path.join(os.path.dirname(report_path), 'plots')
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            plots = executor.submit(render_plots, results, plots_dir)
+            generate_report(results, report_path)
+            print(f"Rendered {len(plots.result())} plots to {plots_dir}")
+    else:
+        generate_report(results, report_path, include_plots=False)
     
     print(f"Analysis complete! Report saved to {report_path}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Speech intelligence analysis pipeline")
+    parser.add_argument('--pitch-estimator', choices=list(PITCH_ESTIMATORS), default='pyin',
+                        help="F0 backend: pyin is most accurate, yin and autocorr are much faster")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU, 1 runs in-process)")
+    parser.add_argument('--no-save-audio', dest='save_audio', action='store_false',
+                        help="Do not write processed audio to data/processed_data/audio")
+    parser.add_argument('--transcription-backend', choices=list(TRANSCRIPTION_BACKENDS), default='google',
+                        help="Speech-to-text engine: google (network), sphinx/whisper (offline), "
+                             "fixture (deterministic stand-in)")
+    parser.add_argument('--no-plots', dest='render', action='store_false',
+                        help="Skip rendering plots; the report is written without images")
+    args = parser.parse_args()
+    main(pitch_estimator=args.pitch_estimator, workers=args.workers, save_audio=args.save_audio,
+         transcription_backend=args.transcription_backend, render=args.render)
@@ -2,14 +2,81 @@ import librosa
 import numpy as np
 import soundfile as sf
 import os
+import queue
+import threading
 
-def preprocess_audio(audio_path, target_sr=16000):
+class AudioArtifactWriter:
+    """
+    Write processed audio files on a background thread
+    
+    Pending writes are held in a bounded queue, so submit() only blocks when
+    the disk falls max_pending files behind. Call flush() before relying on
+    the files (or before a worker process exits), then check() for each file
+    to surface a failed write, and close() when done.
+    """
+    
+    def __init__(self, max_pending=8):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.errors = {}  # output path -> exception of its failed write
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def submit(self, output_path, y, sr):
+        """Queue a waveform to be written to output_path"""
+        self._queue.put((output_path, y, sr))
+    
+    def flush(self):
+        """Wait until every queued file has been written"""
+        self._queue.join()
+    
+    def check(self, output_path):
+        """Raise the error of a failed write to output_path, if any"""
+        error = self.errors.pop(output_path, None)
+        if error is not None:
+            raise error
+    
+    def close(self):
+        """Write the remaining files and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                _write_audio(*item)
+            except Exception as e:
+                print(f"Error writing {item[0]}: {str(e)}")
+                self.errors[item[0]] = e
+            finally:
+                self._queue.task_done()
+
+def _write_audio(output_path, y, sr):
+    """Write under a temporary name so readers never see a partial file"""
+    root, ext = os.path.splitext(output_path)
+    tmp_path = f"{root}.{os.getpid()}.tmp{ext}"
+    sf.write(tmp_path, y, sr)
+    os.replace(tmp_path, output_path)
+
+def preprocess_audio(audio_path, target_sr=16000, save_audio=True, writer=None):
     """
     Preprocess audio file: load, normalize, remove noise, and resample
     
     Args:
         audio_path: Path to the audio file
         target_sr: Target sampling rate
+        save_audio: Write the processed waveform to data/processed_data/audio;
+            in-memory pipelines can skip the write entirely
+        writer: Optional AudioArtifactWriter that writes the file in the
+            background instead of blocking preprocessing
         
     Returns:
         Dictionary with processed audio data and metadata
@@ -36,10 +103,15 @@ def preprocess_audio(audio_path, target_sr=16000):
     y, _ = librosa.effects.trim(y, top_db=30)
     
     # Save processed audio
-    processed_dir = os.path.join('data', 'processed_data', 'audio')
-    os.makedirs(processed_dir, exist_ok=True)
-    output_path = os.path.join(processed_dir, os.path.basename(audio_path))
-    sf.write(output_path, y, sr)
+    output_path = None
+    if save_audio:
+        processed_dir = os.path.join('data', 'processed_data', 'audio')
+        os.makedirs(processed_dir, exist_ok=True)
+        output_path = os.path.join(processed_dir, os.path.basename(audio_path))
+        if writer is not None:
+            writer.submit(output_path, y, sr)
+        else:
+            _write_audio(output_path, y, sr)
     
     return {
         'waveform': y,
@@ -71,6 +143,8 @@ def segment_audio(audio_dict):
         end_time = end / sr
         segment = {
             'id': i,
+            'start_sample': int(start),
+            'end_sample': int(end),
             'start_time': start_time,
             'end_time': end_time,
             'duration': end_time - start_time,
@@ -79,3 +153,45 @@ def segment_audio(audio_dict):
         segments.append(segment)
     
     return segments
+
+def detect_pauses(y, sr, frame_rate=100, silence_db=-35, speech_db=-30,
+                  min_duration=0.3, max_duration=2.0):
+    """
+    Find pauses as runs of low-energy frames
+    
+    Frame RMS energy (relative to the loudest frame) is thresholded with
+    hysteresis: a pause starts when energy drops below silence_db and only
+    ends once it rises above speech_db, so brief dips and zero crossings do
+    not split or create pauses. Everything is vectorized over frames.
+    
+    Args:
+        y: Audio signal
+        sr: Sampling rate
+        frame_rate: Energy frames per second
+        silence_db: Level below which a frame starts a pause
+        speech_db: Level above which a frame ends a pause
+        min_duration: Shortest pause kept, in seconds (exclusive)
+        max_duration: Longest pause kept, in seconds (exclusive)
+        
+    Returns:
+        Array of shape (n_pauses, 2) with start and end sample of each pause
+    """
+    hop_length = max(1, int(sr // frame_rate))
+    rms = librosa.feature.rms(y=y, frame_length=hop_length, hop_length=hop_length, center=False)[0]
+    if rms.size == 0 or rms.max() <= 0:
+        return np.zeros((0, 2), dtype=int)
+    level_db = librosa.amplitude_to_db(rms, ref=np.max)
+    
+    # Hysteresis: frames between the thresholds inherit the last decided state
+    decided = (level_db < silence_db) | (level_db > speech_db)
+    last_decided = np.maximum.accumulate(np.where(decided, np.arange(len(level_db)), -1))
+    is_pause = np.where(last_decided >= 0, level_db[np.maximum(last_decided, 0)] < silence_db, False)
+    
+    # Run boundaries of pause frames
+    edges = np.diff(np.concatenate(([0], is_pause.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1) * hop_length
+    ends = np.minimum(np.flatnonzero(edges == -1) * hop_length, len(y))
+    
+    durations = (ends - starts) / sr
+    keep = (durations > min_duration) & (durations < max_duration)
+    return np.column_stack((starts[keep], ends[keep]))
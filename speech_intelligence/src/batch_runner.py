@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from src.audio_processor import preprocess_audio, AudioArtifactWriter
+from src.transcriber import transcribe_audio
+from src.feature_extractor import extract_features, FEATURE_VERSION
+from src.feature_cache import _to_builtin
+
+class BatchManifest:
+    """
+    Append-only record of which audio files have current feature outputs
+
+    Each line of the manifest is a JSON record for one file (its mtime, size,
+    content hash, extractor parameters and output path); the last record for
+    a path wins. Appending one line per finished file keeps the manifest
+    consistent after a crash: at worst the final, partially written line is
+    ignored and that file is processed again.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.records = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Truncated by an interrupted run
+                    self.records[record['audio_path']] = record
+
+    def is_current(self, audio_path, params):
+        """True if the file already has a successful output for these parameters"""
+        record = self.records.get(os.path.abspath(audio_path))
+        if record is None or record.get('error') or record.get('params') != params:
+            return False
+        if not os.path.exists(record['output_path']):
+            return False
+
+        stat = os.stat(audio_path)
+        if record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+            return True
+
+        # Touched but possibly unchanged (e.g. re-copied): compare content
+        if record['size'] == stat.st_size and record['file_hash'] == file_hash(audio_path):
+            self.record(audio_path, params, record['output_path'])
+            return True
+        return False
+
+    def record(self, audio_path, params, output_path=None, error=None):
+        """Append the outcome for one file"""
+        stat = os.stat(audio_path)
+        record = {
+            'audio_path': os.path.abspath(audio_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'file_hash': file_hash(audio_path),
+            'params': params,
+            'output_path': output_path,
+            'error': error
+        }
+        self.records[record['audio_path']] = record
+        with open(self.manifest_path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """Content hash of a file on disk"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Background writer for processed audio, one per (worker) process; a forked
+# worker must not reuse the parent's writer since its thread is not copied
+_artifact_writer = None
+_artifact_writer_pid = None
+
+def process_file(audio_path, output_dir, pitch_estimator='pyin', cache=None, save_audio=True,
+                 transcription_backend='google'):
+    """
+    Run preprocess -> transcribe -> extract for one file and write its feature row
+
+    The processed audio artifact (if saved) is written in the background while
+    the file is transcribed and its features are extracted.
+
+    Returns the path of the per-file JSON output.
+    """
+    global _artifact_writer, _artifact_writer_pid
+    if save_audio and _artifact_writer_pid != os.getpid():
+        _artifact_writer = AudioArtifactWriter()
+        _artifact_writer_pid = os.getpid()
+
+    processed_audio = preprocess_audio(audio_path, save_audio=save_audio, writer=_artifact_writer)
+    # An unreachable engine fails the file (to be retried) instead of recording it as silent
+    transcript = transcribe_audio(processed_audio, backend=transcription_backend,
+                                  raise_request_errors=True)
+    features = extract_features(processed_audio, transcript, cache=cache,
+                                pitch_estimator=pitch_estimator)
+    features['file_name'] = os.path.basename(audio_path)
+
+    # Pool workers exit without running cleanup, so finish the artifact here;
+    # a failed write fails the file, which is then retried on the next run
+    if save_audio:
+        _artifact_writer.flush()
+        _artifact_writer.check(processed_audio['processed_path'])
+
+    # Keep the extension so clip.wav and clip.mp3 get separate outputs
+    base_name = os.path.basename(audio_path).replace('.', '_')
+    output_path = os.path.join(output_dir, f"{base_name}_features.json")
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({k: _to_builtin(v) for k, v in features.items()}, f, indent=2)
+    os.replace(tmp_path, output_path)  # Never leave a partial output behind
+    return output_path
+
+def _process_file_worker(audio_path, output_dir, pitch_estimator, cache, save_audio,
+                         transcription_backend):
+    """Worker entry point: report failures instead of raising"""
+    try:
+        return process_file(audio_path, output_dir, pitch_estimator, cache, save_audio,
+                            transcription_backend), None
+    except Exception as e:
+        traceback.print_exc()
+        return None, f"{type(e).__name__}: {e}"
+
+def run_batch(audio_files, output_dir, workers=None, pitch_estimator='pyin', cache=None,
+              manifest_path=None, save_audio=True, transcription_backend='google'):
+    """
+    Process audio files with a worker pool, skipping files with current outputs
+
+    Each file's features are written to output_dir as soon as it finishes and
+    recorded in the manifest, so an interrupted run resumes where it stopped
+    and a failing file only loses its own row. Failed files are retried on
+    the next run. save_audio=False skips writing processed audio artifacts.
+
+    Returns:
+        DataFrame with one row per successfully processed file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if manifest_path is None:
+        manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    manifest = BatchManifest(manifest_path)
+    params = {'version': FEATURE_VERSION, 'pitch_estimator': pitch_estimator,
+              'transcription_backend': transcription_backend}
+
+    pending = [path for path in audio_files if not manifest.is_current(path, params)]
+    print(f"{len(audio_files) - len(pending)}/{len(audio_files)} files up to date, "
+          f"processing {len(pending)}")
+
+    failed = 0
+    if workers <= 1 or len(pending) <= 1:
+        for audio_path in pending:
+            output_path, error = _process_file_worker(audio_path, output_dir, pitch_estimator, cache,
+                                                        save_audio, transcription_backend)
+            manifest.record(audio_path, params, output_path, error)
+            failed += error is not None
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {
+                executor.submit(_process_file_worker, path, output_dir, pitch_estimator, cache,
+                                save_audio, transcription_backend): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                audio_path = futures[future]
+                try:
+                    output_path, error = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. killed by the OS)
+                    output_path, error = None, f"{type(e).__name__}: {e}"
+                if error:
+                    print(f"Failed {audio_path}: {error}")
+                manifest.record(audio_path, params, output_path, error)
+                failed += error is not None
+
+    if failed:
+        print(f"{failed} files failed; they will be retried on the next run")
+
+    # Collect the rows of every input file with a current output
+    rows = []
+    for audio_path in audio_files:
+        record = manifest.records.get(os.path.abspath(audio_path))
+        if record and not record['error']:
+            with open(record['output_path']) as f:
+                rows.append(json.load(f))
+    return pd.DataFrame(rows)
@@ -1,55 +1,76 @@
 import numpy as np
 import librosa
 import re
-import pandas as pd
+from scipy.signal import find_peaks
 from textblob import TextBlob
+from src.audio_processor import detect_pauses
+from src.feature_cache import FeatureCache
+from src.pitch_estimators import get_pitch_estimator
 
-def extract_features(audio_dict, transcript_dict):
+# Bump whenever feature definitions change so cached results are not reused
+FEATURE_VERSION = 4
+
+def extract_features(audio_dict, transcript_dict, cache=None, pitch_estimator='pyin'):
     """
     Extract features from audio and transcript
     
     Args:
         audio_dict: Dictionary with audio data
         transcript_dict: Dictionary with transcript data
+        cache: Optional FeatureCache; features of previously seen audio and
+            transcript are returned from it instead of being recomputed
+        pitch_estimator: Pitch backend name ('pyin', 'yin', 'autocorr') or a
+            PitchEstimator instance
         
     Returns:
         Dictionary of extracted features
     """
+    if cache is not None:
+        audio_hash = FeatureCache.audio_hash(audio_dict['waveform'], audio_dict['sample_rate'])
+        params = _cache_params(transcript_dict, pitch_estimator)
+        cached = cache.get(audio_hash, params)
+        if cached is not None:
+            return cached
+    
     features = {}
     
     # Extract acoustic features
-    acoustic_features = extract_acoustic_features(audio_dict)
+    acoustic_features = extract_acoustic_features(audio_dict, pitch_estimator)
     features.update(acoustic_features)
     
     # Extract linguistic features
     linguistic_features = extract_linguistic_features(transcript_dict)
     features.update(linguistic_features)
     
+    # Pauses relative to the number of spoken sentences
+    sentence_count = features['sentence_count']
+    features['pauses_per_sentence'] = features['pause_count'] / sentence_count if sentence_count > 0 else 0
+    
+    if cache is not None:
+        cache.put(audio_hash, params, features)
+    
     return features
 
-def extract_acoustic_features(audio_dict):
-    """Extract features from audio data"""
+def _cache_params(transcript_dict, pitch_estimator='pyin'):
+    """Extractor parameters and transcript identity for the feature cache key"""
+    return {
+        'version': FEATURE_VERSION,
+        'pitch_estimator': get_pitch_estimator(pitch_estimator).name,
+        'transcript': FeatureCache.text_hash(transcript_dict['full_transcript'])
+    }
+
+def extract_acoustic_features(audio_dict, pitch_estimator='pyin'):
+    """Extract features from audio data using the selected pitch backend"""
     y = audio_dict['waveform']
     sr = audio_dict['sample_rate']
     
     # Calculate speech rate (syllables per second)
-    # This is a rough approximation
-    envelope = np.abs(y)
-    envelope = pd.Series(envelope).rolling(int(sr * 0.03)).mean().fillna(0).values
-    peaks = librosa.util.peak_pick(envelope, pre_max=int(sr*0.03), 
-                                  post_max=int(sr*0.03), 
-                                  pre_avg=int(sr*0.1), 
-                                  post_avg=int(sr*0.1), 
-                                  delta=0.1, 
-                                  wait=int(sr*0.1))
-    num_syllables = len(peaks)
+    # This is a rough approximation: one syllable per energy-envelope peak
+    num_syllables = len(detect_syllable_nuclei(y, sr))
     speech_rate = num_syllables / audio_dict['duration']
     
     # Calculate pitch (F0) statistics
-    f0, voiced_flag, _ = librosa.pyin(y, 
-                                     fmin=librosa.note_to_hz('C2'), 
-                                     fmax=librosa.note_to_hz('C5'),
-                                     sr=sr)
+    f0 = get_pitch_estimator(pitch_estimator).estimate(y, sr)
     
     # Remove NaN values
     f0 = f0[~np.isnan(f0)]
@@ -61,23 +82,11 @@ def extract_acoustic_features(audio_dict):
     else:
         pitch_mean = pitch_std = pitch_range = 0
     
-    # Calculate pauses
-    silence_threshold = 0.015
-    is_silence = np.abs(y) < silence_threshold
-    silence_runs = np.where(np.diff(np.hstack(([False], is_silence, [False]))))[0].reshape(-1, 2)
-    
-    # Only count pauses longer than 0.3 seconds but shorter than 2 seconds
-    pause_min_length = int(0.3 * sr)
-    pause_max_length = int(2.0 * sr)
-    
-    pauses = [run for run in silence_runs if pause_min_length < (run[1] - run[0]) < pause_max_length]
+    # Calculate pauses longer than 0.3 seconds but shorter than 2 seconds
+    pauses = detect_pauses(y, sr, min_duration=0.3, max_duration=2.0)
+    pause_durations = (pauses[:, 1] - pauses[:, 0]) / sr
     pause_count = len(pauses)
-    
-    if pause_count > 0:
-        pause_durations = [(p[1] - p[0]) / sr for p in pauses]
-        avg_pause_duration = np.mean(pause_durations)
-    else:
-        avg_pause_duration = 0
+    avg_pause_duration = pause_durations.mean() if pause_count > 0 else 0
     
     return {
         'speech_rate': speech_rate,
@@ -87,9 +96,35 @@ def extract_acoustic_features(audio_dict):
         'pitch_range': pitch_range,
         'pause_count': pause_count,
         'avg_pause_duration': avg_pause_duration,
-        'total_pause_time': pause_count * avg_pause_duration
+        'total_pause_time': pause_durations.sum()
     }
 
+def detect_syllable_nuclei(y, sr, frame_rate=100, smoothing=0.05, min_gap=0.1, prominence=0.1):
+    """
+    Find syllable nuclei as peaks of a frame-rate energy envelope
+    
+    The signal is reduced to an RMS envelope at frame_rate frames per second,
+    smoothed with a short Hann window and normalized to its maximum, so peak
+    picking runs over a few hundred values per second instead of every sample.
+    
+    Returns:
+        Array of nucleus times in seconds
+    """
+    hop_length = max(1, int(sr // frame_rate))
+    envelope = librosa.feature.rms(y=y, frame_length=2 * hop_length, hop_length=hop_length)[0]
+    
+    # Centred smoothing that keeps the envelope length even when the clip is
+    # shorter than the window (mode='same' would return the window's length)
+    window = np.hanning(max(3, int(smoothing * frame_rate)) + 2)[1:-1]
+    start = (len(window) - 1) // 2
+    envelope = np.convolve(envelope, window / window.sum())[start:start + len(envelope)]
+    if envelope.size == 0 or envelope.max() <= 0:
+        return np.zeros(0)
+    envelope /= envelope.max()
+    
+    peaks, _ = find_peaks(envelope, distance=max(1, int(min_gap * frame_rate)), prominence=prominence)
+    return peaks * hop_length / sr
+
 def extract_linguistic_features(transcript_dict):
     """Extract features from transcript"""
     full_text = transcript_dict['full_transcript']
@@ -5,18 +5,25 @@ from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from sklearn.ensemble import IsolationForest
 from sklearn.metrics import silhouette_score
-import matplotlib.pyplot as plt
-import os
+from joblib import Parallel, delayed
 
-def analyze_features(features_df):
+# Attribution methods for feature_importance_anomaly
+IMPORTANCE_METHODS = ['ablation', 'permutation']
+
+def analyze_features(features_df, importance_method='ablation', n_jobs=-1):
     """
     Apply machine learning techniques to analyze speech features
     
     Args:
         features_df: DataFrame with extracted features
+        importance_method: 'ablation' refits the forest without each feature
+            (in parallel); 'permutation' scores every feature on the single
+            fitted forest without refitting
+        n_jobs: Parallel jobs for the ablation fits (-1 uses all CPUs)
         
     Returns:
-        Dictionary with analysis results
+        Dictionary with analysis results (data only; plots are drawn by
+        plot_renderer.render_plots)
     """
     # Store original data
     original_df = features_df.copy()
@@ -61,37 +68,12 @@ def analyze_features(features_df):
     is_anomaly = anomalies == -1
     
     # Calculate feature importance for anomaly detection
-    feature_scores = {}
-    for i, feature in enumerate(features_to_analyze):
-        # Train a model with all features except this one
-        X_without = np.delete(X_scaled, i, axis=1)
-        iso_without = IsolationForest(contamination=0.2, random_state=42)
-        anomalies_without = iso_without.fit_predict(X_without) == -1
-        
-        # Calculate how much this feature contributes to anomaly detection
-        feature_scores[feature] = np.mean(is_anomaly != anomalies_without)
-    
-    # Visualize results
-    plt.figure(figsize=(12, 8))
-    
-    # Create plots directory
-    plots_dir = os.path.join('reports', 'plots')
-    os.makedirs(plots_dir, exist_ok=True)
-    
-    # Plot PCA with clusters and anomalies
-    plt.scatter(X_pca[:, 0], X_pca[:, 1], c=clusters, cmap='viridis', alpha=0.7)
-    plt.scatter(X_pca[is_anomaly, 0], X_pca[is_anomaly, 1], 
-               edgecolors='red', facecolors='none', s=100, label='Potential Cognitive Impairment')
-    
-    for i, txt in enumerate(original_df['file_name']):
-        plt.annotate(txt, (X_pca[i, 0], X_pca[i, 1]))
-    
-    plt.title('Speech Pattern Analysis')
-    plt.xlabel(f'Principal Component 1 ({pca.explained_variance_ratio_[0]:.2%} variance)')
-    plt.ylabel(f'Principal Component 2 ({pca.explained_variance_ratio_[1]:.2%} variance)')
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(os.path.join(plots_dir, 'speech_pattern_analysis.png'))
+    if importance_method == 'ablation':
+        feature_scores = ablation_importance(X_scaled, is_anomaly, features_to_analyze, n_jobs=n_jobs)
+    elif importance_method == 'permutation':
+        feature_scores = permutation_importance(isolation_forest, X_scaled, features_to_analyze)
+    else:
+        raise ValueError(f"Unknown importance method '{importance_method}', choose from {IMPORTANCE_METHODS}")
     
     # Add results to original dataframe
     original_df['cluster'] = clusters
@@ -113,9 +95,57 @@ def analyze_features(features_df):
         'original_data': original_df,
         'pca_components': pca.components_,
         'pca_variance': pca.explained_variance_ratio_,
+        'pca_projection': X_pca,
         'feature_importance': feature_importance,
         'feature_importance_anomaly': feature_scores,
         'correlations': correlations,
         'cluster_profiles': cluster_profiles,
         'features_analyzed': features_to_analyze
     }
+
+def _ablation_score(X_scaled, i, is_anomaly):
+    """Share of anomaly labels that change when feature i is left out"""
+    # Train a model with all features except this one
+    X_without = np.delete(X_scaled, i, axis=1)
+    iso_without = IsolationForest(contamination=0.2, random_state=42)
+    anomalies_without = iso_without.fit_predict(X_without) == -1
+    return np.mean(is_anomaly != anomalies_without)
+
+def ablation_importance(X_scaled, is_anomaly, features, n_jobs=-1):
+    """
+    Leave-one-feature-out importance, fitting the ablation forests concurrently
+    
+    Returns:
+        Dictionary mapping each feature to the fraction of anomaly labels that
+        change without it
+    """
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_ablation_score)(X_scaled, i, is_anomaly) for i in range(len(features)))
+    return dict(zip(features, scores))
+
+def permutation_importance(forest, X_scaled, features, n_repeats=5, random_state=42):
+    """
+    Permutation importance on a single fitted IsolationForest
+    
+    Each feature column is shuffled n_repeats times and the forest rescored;
+    a feature matters when shuffling it makes the flagged samples look less
+    anomalous. The mean score increase over flagged samples, normalized to
+    sum to 1, is that feature's importance. Needs only scoring passes, no refits.
+    """
+    rng = np.random.default_rng(random_state)
+    baseline = forest.score_samples(X_scaled)
+    flagged = forest.predict(X_scaled) == -1
+    if not flagged.any():
+        return dict.fromkeys(features, 0.0)
+    
+    changes = np.zeros(len(features))
+    for i in range(len(features)):
+        X_permuted = X_scaled.copy()
+        for _ in range(n_repeats):
+            X_permuted[:, i] = rng.permutation(X_scaled[:, i])
+            changes[i] += np.mean(forest.score_samples(X_permuted)[flagged] - baseline[flagged])
+    
+    changes = np.clip(changes / n_repeats, 0, None)
+    total = changes.sum()
+    scores = changes / total if total > 0 else changes
+    return dict(zip(features, scores))
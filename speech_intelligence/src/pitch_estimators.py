@@ -0,0 +1,109 @@
+import numpy as np
+import librosa
+
+class PitchEstimator:
+    """
+    Base class for fundamental frequency (F0) estimators
+
+    estimate() returns one F0 value in Hz per frame, with NaN for unvoiced
+    frames, so all backends can be swapped in extract_acoustic_features.
+    """
+    name = None
+
+    def __init__(self, fmin=None, fmax=None, frame_length=2048, hop_length=512):
+        self.fmin = fmin if fmin is not None else librosa.note_to_hz('C2')
+        self.fmax = fmax if fmax is not None else librosa.note_to_hz('C5')
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+
+    def estimate(self, y, sr):
+        raise NotImplementedError
+
+    def _energy_gate(self, y, f0, threshold_db=-35):
+        """Mark frames far below the clip's peak energy as unvoiced"""
+        rms = librosa.feature.rms(y=y, frame_length=self.frame_length, hop_length=self.hop_length)[0]
+        if rms.max() > 0:
+            rms_db = librosa.amplitude_to_db(rms, ref=np.max)
+        else:
+            rms_db = np.full(rms.shape, -np.inf)  # Silence has no voiced frames
+        n = min(len(f0), len(rms_db))
+        f0 = f0[:n].copy()
+        f0[rms_db[:n] < threshold_db] = np.nan
+        return f0
+
+class PyinEstimator(PitchEstimator):
+    """Probabilistic YIN with HMM voicing decoding (accurate, slow)"""
+    name = 'pyin'
+
+    def estimate(self, y, sr):
+        f0, _, _ = librosa.pyin(y, fmin=self.fmin, fmax=self.fmax, sr=sr,
+                                frame_length=self.frame_length, hop_length=self.hop_length)
+        return f0
+
+class YinEstimator(PitchEstimator):
+    """Plain YIN with an energy-based voicing gate (much faster than pyin)"""
+    name = 'yin'
+
+    def estimate(self, y, sr):
+        f0 = librosa.yin(y, fmin=self.fmin, fmax=self.fmax, sr=sr,
+                         frame_length=self.frame_length, hop_length=self.hop_length)
+        return self._energy_gate(y, f0)
+
+class AutocorrelationEstimator(PitchEstimator):
+    """
+    Normalized autocorrelation peak picking, vectorized over all frames
+
+    The fastest backend; frames whose best autocorrelation peak is weaker than
+    voicing_threshold (or that are too quiet) are reported as unvoiced.
+    """
+    name = 'autocorr'
+
+    def __init__(self, voicing_threshold=0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.voicing_threshold = voicing_threshold
+
+    def estimate(self, y, sr):
+        padded = np.pad(y, self.frame_length // 2)  # Centre frames like librosa
+        frames = librosa.util.frame(padded, frame_length=self.frame_length, hop_length=self.hop_length)
+        frames = frames - frames.mean(axis=0)
+
+        # Autocorrelation of every frame at once via the power spectrum
+        n_fft = 2 * self.frame_length
+        spectrum = np.fft.rfft(frames, n=n_fft, axis=0)
+        autocorr = np.fft.irfft(np.abs(spectrum) ** 2, n=n_fft, axis=0)[:self.frame_length]
+        energy = np.maximum(autocorr[0], 1e-10)
+        autocorr = autocorr / energy
+
+        min_lag = max(1, int(sr / self.fmax))
+        max_lag = min(self.frame_length - 2, int(sr / self.fmin))
+        search = autocorr[min_lag:max_lag + 1]
+        lags = search.argmax(axis=0) + min_lag
+        peaks = search.max(axis=0)
+
+        # Parabolic interpolation around the peak for sub-sample lag precision
+        columns = np.arange(autocorr.shape[1])
+        left = autocorr[lags - 1, columns]
+        centre = autocorr[lags, columns]
+        right = autocorr[lags + 1, columns]
+        denominator = left - 2 * centre + right
+        curved = np.abs(denominator) > 1e-10  # Flat peaks keep the integer lag
+        offset = np.divide(0.5 * (left - right), denominator, out=np.zeros_like(denominator),
+                           where=curved)
+
+        f0 = sr / (lags + np.clip(offset, -1, 1))
+        f0[peaks < self.voicing_threshold] = np.nan
+        return self._energy_gate(y, f0)
+
+PITCH_ESTIMATORS = {
+    PyinEstimator.name: PyinEstimator,
+    YinEstimator.name: YinEstimator,
+    AutocorrelationEstimator.name: AutocorrelationEstimator,
+}
+
+def get_pitch_estimator(estimator='pyin'):
+    """Return a PitchEstimator for a backend name (instances are passed through)"""
+    if isinstance(estimator, PitchEstimator):
+        return estimator
+    if estimator not in PITCH_ESTIMATORS:
+        raise ValueError(f"Unknown pitch estimator '{estimator}', choose from {list(PITCH_ESTIMATORS)}")
+    return PITCH_ESTIMATORS[estimator]()
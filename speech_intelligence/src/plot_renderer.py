@@ -0,0 +1,73 @@
+import os
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+def _new_figure(figsize):
+    """Create a figure on the Agg canvas, outside pyplot's global figure registry"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+def _save(fig, path):
+    fig.tight_layout()
+    fig.savefig(path)
+    fig.clear()  # Release artists right away; nothing else references the figure
+    return path
+
+def render_speech_pattern_plot(results, plots_dir):
+    """PCA projection coloured by cluster, with anomalies circled"""
+    data = results['original_data']
+    X_pca = results['pca_projection']
+    is_anomaly = data['potential_impairment'].to_numpy()
+
+    fig, ax = _new_figure((12, 8))
+    ax.scatter(X_pca[:, 0], X_pca[:, 1], c=data['cluster'], cmap='viridis', alpha=0.7)
+    ax.scatter(X_pca[is_anomaly, 0], X_pca[is_anomaly, 1],
+               edgecolors='red', facecolors='none', s=100, label='Potential Cognitive Impairment')
+
+    for i, txt in enumerate(data['file_name']):
+        ax.annotate(txt, (X_pca[i, 0], X_pca[i, 1]))
+
+    ax.set_title('Speech Pattern Analysis')
+    ax.set_xlabel(f'Principal Component 1 ({results["pca_variance"][0]:.2%} variance)')
+    ax.set_ylabel(f'Principal Component 2 ({results["pca_variance"][1]:.2%} variance)')
+    ax.legend()
+    return _save(fig, os.path.join(plots_dir, 'speech_pattern_analysis.png'))
+
+def render_feature_correlations(results, plots_dir):
+    """Bar chart of each feature's correlation with the anomaly score"""
+    fig, ax = _new_figure((10, 6))
+    pd.Series(results['correlations']).sort_values().plot(kind='barh', ax=ax)
+    ax.set_title('Feature Correlation with Anomaly Score')
+    return _save(fig, os.path.join(plots_dir, 'feature_correlations.png'))
+
+def render_feature_importance(results, plots_dir):
+    """Bar chart of feature importance for anomaly detection"""
+    importance_df = pd.DataFrame({
+        'Feature': list(results['feature_importance_anomaly'].keys()),
+        'Importance': list(results['feature_importance_anomaly'].values())
+    }).sort_values('Importance', ascending=False)
+
+    fig, ax = _new_figure((10, 6))
+    sns.barplot(x='Importance', y='Feature', data=importance_df, ax=ax)
+    ax.set_title('Feature Importance for Cognitive Impairment Detection')
+    return _save(fig, os.path.join(plots_dir, 'feature_importance.png'))
+
+def render_plots(results, plots_dir):
+    """
+    Render every analysis plot to plots_dir
+
+    Uses the Agg canvas directly, so it works headless regardless of the
+    configured matplotlib backend and leaves no open pyplot figures behind.
+
+    Returns:
+        List of written image paths
+    """
+    os.makedirs(plots_dir, exist_ok=True)
+    return [
+        render_speech_pattern_plot(results, plots_dir),
+        render_feature_correlations(results, plots_dir),
+        render_feature_importance(results, plots_dir)
+    ]
@@ -1,42 +1,22 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
-import seaborn as sns
 import numpy as np
 
-def generate_report(results, output_path):
+def generate_report(results, output_path, include_plots=True):
     """
     Generate a markdown report from analysis results
     
     Args:
         results: Dictionary with analysis results
         output_path: Path to save the report
+        include_plots: Link the images written by plot_renderer.render_plots
+            to the report's plots directory
     """
-    # Create directory for plots
-    plots_dir = os.path.join(os.path.dirname(output_path), 'plots')
-    os.makedirs(plots_dir, exist_ok=True)
-    
-    # Create correlation heatmap
-    corr_data = pd.Series(results['correlations'])
-    plt.figure(figsize=(10, 6))
-    corr_data.sort_values().plot(kind='barh')
-    plt.title('Feature Correlation with Anomaly Score')
-    plt.tight_layout()
-    corr_path = os.path.join(plots_dir, 'feature_correlations.png')
-    plt.savefig(corr_path)
-    
-    # Create feature importance plot for anomaly detection
-    plt.figure(figsize=(10, 6))
     importance_df = pd.DataFrame({
         'Feature': list(results['feature_importance_anomaly'].keys()),
         'Importance': list(results['feature_importance_anomaly'].values())
     })
     importance_df = importance_df.sort_values('Importance', ascending=False)
-    sns.barplot(x='Importance', y='Feature', data=importance_df)
-    plt.title('Feature Importance for Cognitive Impairment Detection')
-    plt.tight_layout()
-    importance_path = os.path.join(plots_dir, 'feature_importance.png')
-    plt.savefig(importance_path)
     
     # Extract top features
     top_features = importance_df.head(3)['Feature'].tolist()
@@ -57,11 +37,14 @@ def generate_report(results, output_path):
         f.write("The following features showed the strongest association with cognitive impairment patterns:\n\n")
         for feature in top_features:
             f.write(f"1. **{feature}**: Importance score {results['feature_importance_anomaly'][feature]:.3f}\n")
-        f.write("\n![Feature Importance](plots/feature_importance.png)\n\n")
+        f.write("\n")
+        if include_plots:
+            f.write("![Feature Importance](plots/feature_importance.png)\n\n")
         
         f.write("### Speech Pattern Analysis\n\n")
-        f.write("![Speech Pattern Analysis](plots/speech_pattern_analysis.png)\n\n")
-        f.write("This visualization shows the clustering of speech patterns, with ")
+        if include_plots:
+            f.write("![Speech Pattern Analysis](plots/speech_pattern_analysis.png)\n\n")
+        f.write("The speech pattern analysis shows the clustering of speech patterns, with ")
         f.write("red circles indicating potential cognitive impairment based on anomaly detection.\n\n")
         
         f.write("## ML Methods Used\n\n")
@@ -1,62 +1,83 @@
-import speech_recognition as sr
 import os
-import json
+import threading
+import time
+from src.transcription import Transcriber, get_transcription_backend, to_audio_data
+from src.transcript_store import write_transcript
 
-def transcribe_audio(audio_dict):
+# Backends (and their Recognizers) are created once per process and reused
+_backends = {}
+_backends_lock = threading.Lock()
+
+def _shared_backend(backend):
+    """Return the process-wide instance of a backend name (instances pass through)"""
+    if not isinstance(backend, str):
+        return get_transcription_backend(backend)
+    with _backends_lock:
+        if backend not in _backends:
+            _backends[backend] = get_transcription_backend(backend)
+        return _backends[backend]
+
+def transcribe_audio(audio_dict, backend='google', max_workers=4, cache=None,
+                     raise_request_errors=False):
     """
     Transcribe audio to text
     
+    Segments are sent to the backend concurrently, at most max_workers at a
+    time (max_workers=1 transcribes them one after another), and reassembled
+    in order, so a segmented clip takes about as long as its slowest segment.
+    
     Args:
         audio_dict: Dictionary with audio data
-        
+        backend: Transcription backend name ('google', 'sphinx', 'whisper',
+            'fixture') or a TranscriptionBackend instance
+        max_workers: Maximum number of segments transcribed concurrently
+        cache: Optional FeatureCache for per-segment transcripts
+        raise_request_errors: Raise speech_recognition.RequestError when the
+            backend is unavailable instead of transcribing the audio as ""
+    
     Returns:
-        Dictionary with transcript and metadata
+        Dictionary with transcript, per-segment timing and metadata
     """
-    recognizer = sr.Recognizer()
+    transcriber = Transcriber(_shared_backend(backend), max_workers=max_workers, cache=cache,
+                              raise_request_errors=raise_request_errors)
+    start = time.perf_counter()
     
-    # If we have segments, transcribe each segment
+    # If we have segments, transcribe them concurrently
     if 'segments' in audio_dict:
         segments = audio_dict['segments']
-        for segment in segments:
-            segment['transcript'] = _transcribe_segment(segment['waveform'], 
-                                                       audio_dict['sample_rate'],
-                                                       recognizer)
-        
+        results = transcriber.transcribe_many(
+            [to_audio_data(s['waveform'], audio_dict['sample_rate']) for s in segments],
+            with_timing=True)
+        for segment, (transcript, seconds) in zip(segments, results):
+            segment['transcript'] = transcript
+            segment['transcription_time'] = seconds
+    
         full_transcript = " ".join([s['transcript'] for s in segments])
     else:
         # Transcribe full audio
-        full_transcript = _transcribe_segment(audio_dict['waveform'], 
-                                             audio_dict['sample_rate'],
-                                             recognizer)
+        full_transcript = transcriber.transcribe(
+            to_audio_data(audio_dict['waveform'], audio_dict['sample_rate']))
+    
+    total_time = time.perf_counter() - start
+    segment_times = [s['transcription_time'] for s in audio_dict.get('segments', [])]
+    if segment_times:
+        print(f"Transcribed {len(segment_times)} segments in {total_time:.2f}s "
+              f"(slowest {max(segment_times):.2f}s, sum {sum(segment_times):.2f}s)")
     
     # Save transcript
     transcripts_dir = os.path.join('data', 'processed_data', 'transcripts')
     os.makedirs(transcripts_dir, exist_ok=True)
     
     base_name = os.path.splitext(os.path.basename(audio_dict['original_path']))[0]
-    transcript_path = os.path.join(transcripts_dir, f"{base_name}_transcript.json")
+    transcript_path = os.path.join(transcripts_dir, f"{base_name}_transcript.jsonl")
     
     transcript_data = {
         'full_transcript': full_transcript,
-        'segments': audio_dict.get('segments', [])
+        'segments': audio_dict.get('segments', []),
+        'transcription_time': total_time
     }
     
-    with open(transcript_path, 'w') as f:
-        json.dump(transcript_data, f, indent=2)
+    # Segment audio is stored as offsets into the processed audio, not copied
+    write_transcript(transcript_path, transcript_data, audio_dict)
     
     return transcript_data
-
-def _transcribe_segment(audio_data, sample_rate, recognizer):
-    """Helper function to transcribe an audio segment"""
-    try:
-        # Convert numpy array to AudioData
-        audio = sr.AudioData(audio_data.tobytes(), 
-                            sample_rate=sample_rate, 
-                            sample_width=2)  # 16-bit audio
-        
-        # Use Google's speech recognition service
-        transcript = recognizer.recognize_google(audio)
-        return transcript
-    except Exception as e:
-        print(f"Error transcribing segment: {str(e)}")
-        return ""
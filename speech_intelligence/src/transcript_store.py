@@ -0,0 +1,53 @@
+import json
+import os
+from src.feature_cache import _to_builtin
+
+# Bump when the line layout changes
+TRANSCRIPT_FORMAT_VERSION = 1
+
+# Segment fields kept on disk; waveforms are referenced by sample offsets
+SEGMENT_FIELDS = ['id', 'start_sample', 'end_sample', 'start_time', 'end_time',
+                  'duration', 'transcript', 'transcription_time']
+
+def write_transcript(transcript_path, transcript_data, audio_dict):
+    """
+    Write a transcript as compact line-delimited JSON
+
+    The first line holds the full transcript and a reference to the processed
+    audio; each following line is one segment's metadata and text. Segment
+    audio is not copied: start_sample/end_sample index into processed_path.
+
+    Args:
+        transcript_path: Output .jsonl path
+        transcript_data: Dictionary returned by transcribe_audio
+        audio_dict: Dictionary with the processed audio the segments came from
+    """
+    header = {
+        'format_version': TRANSCRIPT_FORMAT_VERSION,
+        'full_transcript': transcript_data['full_transcript'],
+        'transcription_time': transcript_data.get('transcription_time'),
+        'processed_path': audio_dict.get('processed_path'),
+        'original_path': audio_dict.get('original_path'),
+        'sample_rate': audio_dict['sample_rate'],
+        'segment_count': len(transcript_data['segments'])
+    }
+
+    tmp_path = f"{transcript_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(header, separators=(',', ':')) + "\n")
+        for segment in transcript_data['segments']:
+            record = {k: _to_builtin(segment[k]) for k in SEGMENT_FIELDS if k in segment}
+            f.write(json.dumps(record, separators=(',', ':')) + "\n")
+    os.replace(tmp_path, transcript_path)
+
+def load_transcript(transcript_path):
+    """
+    Load a transcript written by write_transcript (no audio is read)
+
+    Returns:
+        Dictionary with the header fields and a 'segments' list
+    """
+    with open(transcript_path) as f:
+        transcript = json.loads(f.readline())
+        transcript['segments'] = [json.loads(line) for line in f if line.strip()]
+    return transcript
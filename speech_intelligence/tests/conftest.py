@@ -0,0 +1,27 @@
+import importlib
+import sys
+import pytest
+from pathlib import Path
+
+# speech_intelligence/src is imported as the top-level package `src`, which
+# clashes with the root project's src; each test swaps it in and back out
+SPEECH_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _take_src_modules():
+    """Remove and return every `src` / `src.*` entry of sys.modules"""
+    names = [name for name in sys.modules if name == 'src' or name.startswith('src.')]
+    return {name: sys.modules.pop(name) for name in names}
+
+
+@pytest.fixture
+def speech_src():
+    """Importer for speech_intelligence modules, e.g. speech_src('batch_runner')"""
+    root_modules = _take_src_modules()
+    sys.path.insert(0, str(SPEECH_ROOT))
+    try:
+        yield lambda name: importlib.import_module(f"src.{name}")
+    finally:
+        sys.path.remove(str(SPEECH_ROOT))
+        _take_src_modules()
+        sys.modules.update(root_modules)
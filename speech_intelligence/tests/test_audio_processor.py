@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+SR = 16000
+
+
+def _tone(duration, f0=220.0, amplitude=0.5):
+    t = np.arange(int(SR * duration)) / SR
+    return (amplitude * np.sin(2 * np.pi * f0 * t)).astype(np.float32)
+
+
+def _with_gaps(gaps, tone_duration=0.5):
+    """Tone bursts separated by silent gaps; returns the signal and gap sample bounds"""
+    parts, bounds, position = [_tone(tone_duration)], [], int(SR * tone_duration)
+    for gap in gaps:
+        silence = np.zeros(int(SR * gap), dtype=np.float32)
+        bounds.append((position, position + len(silence)))
+        parts += [silence, _tone(tone_duration)]
+        position += len(silence) + int(SR * tone_duration)
+    return np.concatenate(parts), bounds
+
+
+def test_detect_pauses_finds_gaps_within_duration_limits(speech_src):
+    detect_pauses = speech_src('audio_processor').detect_pauses
+    y, bounds = _with_gaps([0.1, 0.5, 1.0, 3.0])
+
+    pauses = detect_pauses(y, SR, min_duration=0.3, max_duration=2.0)
+
+    # The 0.1 s gap is too short and the 3 s gap too long to count
+    np.testing.assert_array_equal(pauses, [bounds[1], bounds[2]])
+
+
+def test_detect_pauses_ignores_level_between_thresholds(speech_src):
+    detect_pauses = speech_src('audio_processor').detect_pauses
+    y, bounds = _with_gaps([1.0])
+    # A -32 dB murmur in the middle of the pause neither ends nor splits it
+    start, end = bounds[0]
+    y[start + 4000:start + 8000] = _tone(0.25, amplitude=0.5 * 10 ** (-32 / 20))
+
+    np.testing.assert_array_equal(detect_pauses(y, SR), [bounds[0]])
+
+
+def test_detect_pauses_of_silence_is_empty(speech_src):
+    detect_pauses = speech_src('audio_processor').detect_pauses
+
+    assert detect_pauses(np.zeros(SR, dtype=np.float32), SR).shape == (0, 2)
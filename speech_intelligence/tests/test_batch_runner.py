@@ -0,0 +1,109 @@
+import os
+import numpy as np
+import pytest
+from types import SimpleNamespace
+
+sf = pytest.importorskip("soundfile")
+
+SR = 16000
+
+
+def _write_tone(path, f0):
+    t = np.arange(SR) / SR
+    sf.write(path, (0.5 * np.sin(2 * np.pi * f0 * t)).astype(np.float32), SR)
+
+
+@pytest.fixture
+def batch(speech_src, tmp_path, monkeypatch):
+    """batch_runner with transcription and feature extraction stubbed; records processed files"""
+    monkeypatch.chdir(tmp_path)
+    batch_runner = speech_src('batch_runner')
+    processed, failing = [], set()
+
+    def extract_features(audio_dict, transcript, **kwargs):
+        name = os.path.basename(audio_dict['original_path'])
+        processed.append(name)
+        if name in failing:
+            raise RuntimeError(f"cannot extract {name}")
+        return {'duration': audio_dict['duration']}
+
+    monkeypatch.setattr(batch_runner, 'transcribe_audio',
+                        lambda audio_dict, backend, **kwargs: {'full_transcript': ''})
+    monkeypatch.setattr(batch_runner, 'extract_features', extract_features)
+    return SimpleNamespace(run_batch=batch_runner.run_batch, processed=processed, failing=failing)
+
+
+def test_run_batch_resumes_from_manifest(batch, tmp_path):
+    paths = [str(tmp_path / f"{name}.wav") for name in ("a", "b", "c", "d")]
+    for f0, path in zip((200, 250, 300, 350), paths):
+        _write_tone(path, f0)
+    output_dir = str(tmp_path / "features")
+
+    batch.failing.add("c.wav")
+    first = batch.run_batch(paths, output_dir, workers=1)
+    assert sorted(batch.processed) == ["a.wav", "b.wav", "c.wav", "d.wav"]
+    assert sorted(first['file_name']) == ["a.wav", "b.wav", "d.wav"]
+
+    # b is rewritten with new content, d only touched; c now succeeds
+    batch.failing.clear()
+    _write_tone(paths[1], 400)
+    os.utime(paths[1], ns=(0, os.stat(paths[1]).st_mtime_ns + 10**9))
+    os.utime(paths[3], ns=(0, os.stat(paths[3]).st_mtime_ns + 10**9))
+    batch.processed.clear()
+    second = batch.run_batch(paths, output_dir, workers=1)
+
+    assert sorted(batch.processed) == ["b.wav", "c.wav"]
+    assert sorted(second['file_name']) == ["a.wav", "b.wav", "c.wav", "d.wav"]
+
+    batch.processed.clear()
+    batch.run_batch(paths, output_dir, workers=1)
+    assert batch.processed == []
+
+
+def test_run_batch_retries_failed_audio_write(batch, speech_src, tmp_path, monkeypatch):
+    audio_processor = speech_src('audio_processor')
+    write_audio = audio_processor._write_audio
+    paths = [str(tmp_path / f"{name}.wav") for name in ("a", "b")]
+    for f0, path in zip((200, 250), paths):
+        _write_tone(path, f0)
+    output_dir = str(tmp_path / "features")
+
+    def failing_write(output_path, y, sr):
+        if output_path.endswith("b.wav"):
+            raise OSError("disk full")
+        write_audio(output_path, y, sr)
+
+    monkeypatch.setattr(audio_processor, '_write_audio', failing_write)
+    first = batch.run_batch(paths, output_dir, workers=1)
+    assert list(first['file_name']) == ["a.wav"]
+
+    monkeypatch.setattr(audio_processor, '_write_audio', write_audio)
+    batch.processed.clear()
+    second = batch.run_batch(paths, output_dir, workers=1)
+    assert batch.processed == ["b.wav"]
+    assert list(second['file_name']) == ["a.wav", "b.wav"]
+    assert os.path.exists(os.path.join("data", "processed_data", "audio", "b.wav"))
+
+
+def test_run_batch_retries_files_hit_by_engine_outage(batch, speech_src, tmp_path, monkeypatch):
+    batch_runner, transcriber = speech_src('batch_runner'), speech_src('transcriber')
+    transcription = speech_src('transcription')
+    sr = pytest.importorskip("speech_recognition")
+
+    class OfflineBackend(transcription.TranscriptionBackend):
+        name = 'google'
+
+        def transcribe(self, audio_data):
+            raise sr.RequestError("network unreachable")
+
+    path = str(tmp_path / "a.wav")
+    _write_tone(path, 200)
+    output_dir = str(tmp_path / "features")
+    monkeypatch.setattr(batch_runner, 'transcribe_audio', transcriber.transcribe_audio)
+
+    monkeypatch.setitem(transcriber._backends, 'google', OfflineBackend())
+    assert batch.run_batch([path], output_dir, workers=1).empty
+    assert batch.processed == []
+
+    monkeypatch.setitem(transcriber._backends, 'google', transcription.FixtureBackend(default="hello"))
+    assert list(batch.run_batch([path], output_dir, workers=1)['file_name']) == ["a.wav"]
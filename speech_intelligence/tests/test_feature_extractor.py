@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+SR = 16000
+
+
+def _syllables(rate=4.0, duration=2.0):
+    """200 Hz carrier whose amplitude swells rate times per second"""
+    t = np.arange(int(SR * duration)) / SR
+    envelope = 0.5 - 0.5 * np.cos(2 * np.pi * rate * t)
+    return (np.sin(2 * np.pi * 200 * t) * envelope).astype(np.float32)
+
+
+def test_syllable_nuclei_of_modulated_tone(speech_src):
+    detect_syllable_nuclei = speech_src('feature_extractor').detect_syllable_nuclei
+
+    nuclei = detect_syllable_nuclei(_syllables(), SR)
+
+    # One nucleus per envelope maximum, at 0.125 s + k * 0.25 s
+    np.testing.assert_allclose(nuclei, 0.125 + 0.25 * np.arange(8), atol=0.02)
+
+
+def test_syllable_nuclei_of_silence(speech_src):
+    detect_syllable_nuclei = speech_src('feature_extractor').detect_syllable_nuclei
+
+    assert len(detect_syllable_nuclei(np.zeros(SR, dtype=np.float32), SR)) == 0
+
+
+@pytest.mark.parametrize("n_samples", [0, 1, 10, 100, 400])
+def test_syllable_nuclei_of_very_short_input(speech_src, n_samples):
+    detect_syllable_nuclei = speech_src('feature_extractor').detect_syllable_nuclei
+    y = np.random.default_rng(0).normal(size=n_samples).astype(np.float32)
+
+    nuclei = detect_syllable_nuclei(y, SR)
+
+    assert len(nuclei) <= 1
+    assert np.all((nuclei >= 0) & (nuclei <= n_samples / SR))
+
+
+def test_pauses_per_sentence(speech_src, monkeypatch):
+    feature_extractor = speech_src('feature_extractor')
+    silence = np.zeros(int(0.5 * SR), dtype=np.float32)
+    y = np.concatenate([_syllables(duration=1.0), silence, _syllables(duration=1.0), silence,
+                        _syllables(duration=1.0)])
+    audio = {'waveform': y, 'sample_rate': SR, 'duration': len(y) / SR}
+
+    # Sentence splitting needs TextBlob corpora; only the count matters here
+    for sentence_count, expected in [(2, 1.0), (0, 0)]:
+        monkeypatch.setattr(feature_extractor, 'extract_linguistic_features',
+                            lambda transcript_dict: {'sentence_count': sentence_count})
+        features = feature_extractor.extract_features(audio, {'full_transcript': ""},
+                                                      pitch_estimator='autocorr')
+        assert features['pause_count'] == 2
+        assert features['pauses_per_sentence'] == pytest.approx(expected)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+sklearn = pytest.importorskip("sklearn")
+from sklearn.ensemble import IsolationForest
+
+FEATURES = ['noise_a', 'noise_b', 'signal', 'noise_c']
+
+
+@pytest.fixture
+def anomalies():
+    """Uniform noise features plus one feature that alone separates 20 outliers"""
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-1, 1, size=(100, len(FEATURES)))
+    X[:, 2] = rng.normal(0, 0.1, 100)
+    X[:20, 2] += 10
+    forest = IsolationForest(contamination=0.2, random_state=42).fit(X)
+    return X, forest
+
+
+@pytest.mark.parametrize("method", ['ablation', 'permutation'])
+def test_informative_feature_ranks_first(speech_src, anomalies, method):
+    ml_analyzer = speech_src('ml_analyzer')
+    X, forest = anomalies
+
+    if method == 'ablation':
+        scores = ml_analyzer.ablation_importance(X, forest.predict(X) == -1, FEATURES, n_jobs=1)
+    else:
+        scores = ml_analyzer.permutation_importance(forest, X, FEATURES)
+
+    assert max(scores, key=scores.get) == 'signal'
+
+
+def test_parallel_ablation_matches_serial(speech_src, anomalies):
+    ml_analyzer = speech_src('ml_analyzer')
+    X, forest = anomalies
+    is_anomaly = forest.predict(X) == -1
+
+    serial = ml_analyzer.ablation_importance(X, is_anomaly, FEATURES, n_jobs=1)
+    parallel = ml_analyzer.ablation_importance(X, is_anomaly, FEATURES, n_jobs=2)
+
+    assert parallel == serial
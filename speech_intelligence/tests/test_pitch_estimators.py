@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+SR = 16000
+
+
+def _harmonic_tone(f0, duration=1.0):
+    t = np.arange(int(SR * duration)) / SR
+    return (0.5 * sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 4))).astype(np.float32)
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.parametrize("name", ['yin', 'autocorr'])
+@pytest.mark.parametrize("f0", [110.0, 150.0, 220.0])
+def test_estimators_recover_tone_f0(speech_src, name, f0):
+    estimator = speech_src('pitch_estimators').get_pitch_estimator(name)
+    track = estimator.estimate(_harmonic_tone(f0), SR)
+
+    assert np.isnan(track).mean() < 0.1
+    assert np.nanmedian(track) == pytest.approx(f0, rel=0.02)
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.parametrize("name", ['yin', 'autocorr'])
+def test_estimators_report_silence_as_unvoiced(speech_src, name):
+    estimator = speech_src('pitch_estimators').get_pitch_estimator(name)
+    track = estimator.estimate(np.zeros(SR, dtype=np.float32), SR)
+
+    assert len(track) > 0 and np.isnan(track).all()
@@ -0,0 +1,65 @@
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+plt = pytest.importorskip("matplotlib.pyplot")
+
+from conftest import SPEECH_ROOT
+
+
+@pytest.fixture
+def features_df():
+    rng = np.random.default_rng(0)
+    columns = ['speech_rate', 'pitch_variability', 'pause_count', 'avg_pause_duration', 'filler_rate',
+               'lexical_diversity', 'words_per_sentence', 'word_repetitions', 'word_finding_difficulties']
+    df = pd.DataFrame(rng.uniform(0, 1, size=(12, len(columns))), columns=columns)
+    df['file_name'] = [f"clip{i}.wav" for i in range(12)]
+    return df
+
+
+@pytest.fixture
+def results(speech_src, features_df):
+    return speech_src('ml_analyzer').analyze_features(features_df, importance_method='permutation')
+
+
+def _images(directory):
+    return sorted(path.name for path in directory.rglob("*.png"))
+
+
+def test_render_plots_writes_pngs_without_a_display(speech_src, results, tmp_path, monkeypatch):
+    monkeypatch.delenv('DISPLAY', raising=False)
+    open_figures = plt.get_fignums()
+
+    paths = speech_src('plot_renderer').render_plots(results, tmp_path / "plots")
+
+    assert _images(tmp_path) == ["feature_correlations.png", "feature_importance.png",
+                                 "speech_pattern_analysis.png"]
+    for path in paths:
+        with open(path, 'rb') as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    assert plt.get_fignums() == open_figures  # Nothing left in pyplot's registry
+
+
+def test_report_without_plots_links_no_images(speech_src, results, tmp_path):
+    report_path = tmp_path / "findings.md"
+
+    speech_src('report_generator').generate_report(results, report_path, include_plots=False)
+
+    assert "![" not in report_path.read_text()
+    assert _images(tmp_path) == []
+
+
+def test_no_plots_pipeline_writes_no_images(speech_src, features_df, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    speech_src('batch_runner')  # main imports the speech_intelligence src package
+    spec = importlib.util.spec_from_file_location("speech_main", SPEECH_ROOT / "main.py")
+    speech_main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(speech_main)
+    monkeypatch.setattr(speech_main, 'run_batch', lambda *args, **kwargs: features_df)
+
+    speech_main.main(workers=1, render=False)
+
+    assert (tmp_path / "reports" / "findings.md").exists()
+    assert _images(tmp_path) == []
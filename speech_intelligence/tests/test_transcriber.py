@@ -0,0 +1,74 @@
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("speech_recognition")
+
+SR = 16000
+
+
+def _audio(n_segments=6):
+    rng = np.random.default_rng(0)
+    segments = [{'waveform': rng.uniform(-0.5, 0.5, SR // 10).astype(np.float32),
+                 'start_time': i * 0.1, 'end_time': (i + 1) * 0.1} for i in range(n_segments)]
+    return {'waveform': np.concatenate([s['waveform'] for s in segments]), 'sample_rate': SR,
+            'original_path': "clip.wav", 'segments': segments}
+
+
+@pytest.fixture
+def transcriber(speech_src, tmp_path, monkeypatch):
+    """transcriber writing under tmp_path with an empty backend registry"""
+    monkeypatch.chdir(tmp_path)
+    transcriber = speech_src('transcriber')
+    monkeypatch.setattr(transcriber, '_backends', {})
+    return transcriber
+
+
+def test_transcribe_audio_keeps_segment_order(speech_src, transcriber):
+    transcription = speech_src('transcription')
+    audio = _audio()
+    keys = [transcription.FixtureBackend.audio_key(transcription.to_audio_data(s['waveform'], SR))
+            for s in audio['segments']]
+    finished = [threading.Event() for _ in keys]
+    finish_order = []
+
+    class LastFirstBackend(transcription.FixtureBackend):
+        """Each segment waits for the next, so all must be in flight at once"""
+
+        def transcribe(self, audio_data):
+            i = keys.index(self.audio_key(audio_data))
+            if i + 1 < len(keys) and not finished[i + 1].wait(timeout=5):
+                raise RuntimeError("segments were not transcribed concurrently")
+            finish_order.append(i)
+            finished[i].set()
+            return super().transcribe(audio_data)
+
+    backend = LastFirstBackend({key: f"word{i}" for i, key in enumerate(keys)})
+    result = transcriber.transcribe_audio(audio, backend=backend, max_workers=len(keys))
+
+    assert finish_order == list(range(len(keys) - 1, -1, -1))
+    assert result['full_transcript'] == " ".join(f"word{i}" for i in range(len(keys)))
+    assert [s['transcript'] for s in audio['segments']] == [f"word{i}" for i in range(len(keys))]
+
+
+def test_backend_is_built_once_per_process(speech_src, transcriber, monkeypatch):
+    transcription = speech_src('transcription')
+    built = []
+
+    class CountingFixtureBackend(transcription.FixtureBackend):
+        def __init__(self):
+            super().__init__(default="hello")
+            built.append(self)
+
+    monkeypatch.setitem(transcription.TRANSCRIPTION_BACKENDS, 'fixture', CountingFixtureBackend)
+
+    for _ in range(3):
+        result = transcriber.transcribe_audio(_audio(2), backend='fixture')
+        assert result['full_transcript'] == "hello hello"
+    assert len(built) == 1
+    assert transcriber._shared_backend('fixture') is built[0]
+
+    # Instances are used as given, not registered
+    instance = transcription.FixtureBackend()
+    assert transcriber._shared_backend(instance) is instance
+    assert list(transcriber._backends) == ['fixture']
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def _transcript(segments):
+    return {'full_transcript': " ".join(s['transcript'] for s in segments), 'segments': segments,
+            'transcription_time': 1.5}
+
+
+def test_transcript_round_trip(speech_src, tmp_path):
+    transcript_store = speech_src('transcript_store')
+    segments = [
+        {'id': i, 'start_sample': np.int64(start), 'end_sample': np.int64(start + 8000),
+         'start_time': start / 16000, 'end_time': (start + 8000) / 16000, 'duration': 0.5,
+         'transcript': text, 'transcription_time': np.float64(0.25),
+         'waveform': np.zeros(8000, dtype=np.float32)}
+        for i, (start, text) in enumerate([(0, "hello"), (16000, "world")])
+    ]
+    audio = {'sample_rate': 16000, 'processed_path': "audio/clip.wav", 'original_path': "raw/clip.wav"}
+    path = tmp_path / "clip_transcript.jsonl"
+
+    transcript_store.write_transcript(path, _transcript(segments), audio)
+    loaded = transcript_store.load_transcript(path)
+
+    assert loaded['format_version'] == transcript_store.TRANSCRIPT_FORMAT_VERSION
+    assert loaded['full_transcript'] == "hello world"
+    assert loaded['processed_path'] == "audio/clip.wav"
+    assert loaded['sample_rate'] == 16000 and loaded['segment_count'] == 2
+    # Waveforms are referenced by sample offsets, never copied
+    assert loaded['segments'] == [{k: v for k, v in s.items() if k != 'waveform'} for s in segments]
+    assert [p.name for p in tmp_path.iterdir()] == ["clip_transcript.jsonl"]
+
+
+def test_transcript_without_segments(speech_src, tmp_path):
+    transcript_store = speech_src('transcript_store')
+    path = tmp_path / "clip_transcript.jsonl"
+
+    transcript_store.write_transcript(path, _transcript([]), {'sample_rate': 16000})
+    loaded = transcript_store.load_transcript(path)
+
+    assert loaded['segments'] == [] and loaded['segment_count'] == 0
+    assert loaded['processed_path'] is None
@@ -18,6 +18,7 @@ sys.path.append(str(Path(__file__).resolve().parents[2]))
 from src.tracking.longitudinal_tracker import LongitudinalTracker
 from src.api.audio_processing import process_audio_file
 from src.data_processing.acoustic_analyzer import AcousticAnalyzer
+from src.data_processing.feature_cache import FeatureCache
 from src.data_processing.feature_extractor import FeatureExtractor
 from src.reports.report_generator import ReportGenerator
 from src.models.unsupervised_analyzer import UnsupervisedAnalyzer
@@ -47,7 +48,7 @@ app.add_middleware(
 
 # Initialize components
 tracker = LongitudinalTracker()
-acoustic_analyzer = AcousticAnalyzer()
+acoustic_analyzer = AcousticAnalyzer(cache=FeatureCache())
 feature_extractor = FeatureExtractor()
 report_generator = ReportGenerator()
 unsupervised_analyzer = UnsupervisedAnalyzer()
@@ -204,7 +205,8 @@ async def extract_raw_features(
         
         # Extract features based on feature_set parameter
         if feature_set == "acoustic":
-            features = acoustic_analyzer.extract_acoustic_features(temp_audio_path)
+            features = acoustic_analyzer.extract_features(temp_audio_path)
+            features = {k: float(v) for k, v in features.items()}
         elif feature_set == "linguistic":
             features = feature_extractor.extract_linguistic_features(temp_audio_path)
         elif feature_set == "cognitive":
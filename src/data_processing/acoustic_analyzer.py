@@ -4,23 +4,134 @@ import matplotlib.pyplot as plt
 from pathlib import Path
 import pandas as pd
 import warnings
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.data_processing.spectral_frontend import SpectralFrontend, pitch_statistics
+from src.data_processing.analysis_session import AnalysisSession
+from src.data_processing.feature_cache import FeatureCache
+from src.data_processing.audio_ingest import AudioIngest
+from config import SAMPLE_RATE
+from src.data_processing.streaming import RunningStats, read_mono_blocks, SOUNDFILE_AVAILABLE
 
 # Try importing librosa and its dependencies
 try:
     import librosa
     import librosa.display
+    import soundfile as sf
     LIBROSA_AVAILABLE = True
 except ImportError as e:
     LIBROSA_AVAILABLE = False
     IMPORT_ERROR = str(e)
 
+# Bump whenever feature definitions change so cached results are not reused
+FEATURE_VERSION = 2
+
+# Declarative registry of feature groups: the features each group produces and
+# the groups whose results it reads. Spectral transforms are computed lazily by
+# the analysis session, so only the transforms the requested groups need run.
+FEATURE_GROUPS = {
+    'duration': {'features': ['duration'], 'depends_on': []},
+    'pitch': {'features': ['pitch_mean', 'pitch_std', 'pitch_range', 'pitch_variability'],
+              'depends_on': []},
+    'tremor': {'features': ['tremor_index'], 'depends_on': []},
+    'spectral_centroid': {'features': ['spectral_centroid_mean', 'spectral_centroid_std'],
+                          'depends_on': []},
+    'spectral_bandwidth': {'features': ['spectral_bandwidth_mean'], 'depends_on': []},
+    'spectral_contrast': {'features': ['spectral_contrast_mean'], 'depends_on': []},
+    'spectral_flatness': {'features': ['spectral_flatness_mean'], 'depends_on': []},
+    'spectral_rolloff': {'features': ['rolloff_mean'], 'depends_on': []},
+    'mfcc': {'features': [f'mfcc{i+1}_{stat}' for i in range(13) for stat in ('mean', 'std')],
+             'depends_on': []},
+    'tempo': {'features': ['tempo'], 'depends_on': []},
+    'rhythm': {'features': ['rhythm_strength'], 'depends_on': []},
+    'zero_crossing_rate': {'features': ['zero_crossing_rate_mean', 'zero_crossing_rate_std'],
+                           'depends_on': []},
+    'rms': {'features': ['rms_mean', 'rms_std'], 'depends_on': []},
+    'harmonic_ratio': {'features': ['harmonic_ratio'], 'depends_on': ['spectral_flatness']},
+}
+
+# Named sets of groups that callers can request
+FEATURE_SETS = {
+    'all': list(FEATURE_GROUPS),
+    'spectral': ['spectral_centroid', 'spectral_bandwidth', 'spectral_contrast',
+                 'spectral_flatness', 'spectral_rolloff'],
+    'voice_quality': ['zero_crossing_rate', 'rms', 'harmonic_ratio'],
+    # Everything get_cognitive_indicators reads
+    'cognitive': ['pitch', 'tremor', 'spectral_centroid', 'rhythm',
+                  'zero_crossing_rate', 'rms', 'harmonic_ratio'],
+}
+
+def resolve_feature_groups(feature_set=None):
+    """Resolve set, group or feature names to the groups to compute, in run order"""
+    if feature_set is None:
+        feature_set = 'all'
+    if isinstance(feature_set, str):
+        feature_set = [feature_set]
+    
+    feature_to_group = {name: group for group, spec in FEATURE_GROUPS.items()
+                        for name in spec['features']}
+    
+    requested = set()
+    for name in feature_set:
+        if name in FEATURE_SETS:
+            requested.update(FEATURE_SETS[name])
+        elif name in FEATURE_GROUPS:
+            requested.add(name)
+        elif name in feature_to_group:
+            requested.add(feature_to_group[name])
+        else:
+            raise ValueError(f"Unknown acoustic feature, group or set: {name}")
+    
+    # Add dependencies until the set is closed
+    pending = list(requested)
+    while pending:
+        for dependency in FEATURE_GROUPS[pending.pop()]['depends_on']:
+            if dependency not in requested:
+                requested.add(dependency)
+                pending.append(dependency)
+    
+    # Registry order puts dependencies before the groups that read them
+    return [group for group in FEATURE_GROUPS if group in requested]
+
 class AcousticAnalyzer:
     """Extracts acoustic features from voice recordings"""
     
-    def __init__(self):
-        """Initialize the acoustic analyzer"""
+    def __init__(self, n_fft=2048, hop_length=512, cache=None, streaming_threshold=1200,
+                 sample_rate=SAMPLE_RATE, resampler='soxr_hq', decoded_cache_dir=None):
+        """Initialize the acoustic analyzer
+        
+        Audio is decoded and resampled once to sample_rate (config.SAMPLE_RATE by
+        default; None keeps the native rate) with the given resampler, see
+        AudioIngest; decoded_cache_dir keeps the decoded clips on disk for
+        re-analysis (off by default). Pass a FeatureCache as cache to reuse features of previously
+        analyzed audio. Recordings longer than streaming_threshold seconds are
+        analyzed block by block (see extract_features_streaming); None disables
+        the switch.
+        """
         self.features = {}
+        self.pitch_track = None
         self.dependency_check_performed = False
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.cache = cache
+        self.streaming_threshold = streaming_threshold
+        self.ingest = AudioIngest(sample_rate=sample_rate, resampler=resampler,
+                                  cache_dir=decoded_cache_dir)
+    
+    def _settings(self):
+        """Constructor arguments, used to rebuild the analyzer in worker processes"""
+        return {'n_fft': self.n_fft, 'hop_length': self.hop_length, 'cache': self.cache,
+                'streaming_threshold': self.streaming_threshold,
+                'sample_rate': self.ingest.sample_rate, 'resampler': self.ingest.resampler,
+                'decoded_cache_dir': self.ingest.cache_dir}
+    
+    def _cache_params(self):
+        """Extractor parameters that determine the cached feature values"""
+        return {'version': FEATURE_VERSION, 'n_fft': self.n_fft, 'hop_length': self.hop_length,
+                'sample_rate': self.ingest.sample_rate, 'resampler': self.ingest.resampler}
         
     def _check_dependencies(self):
         """Check if all required dependencies are available"""
@@ -38,182 +149,378 @@ class AcousticAnalyzer:
         return LIBROSA_AVAILABLE
         
     def load_audio(self, audio_path):
-        """Load audio file and convert to mono"""
+        """Load audio file as mono float32 at the analysis sample rate"""
         if not self._check_dependencies():
             return None, None
             
         try:
-            # Load audio file with librosa (automatically resamples)
-            y, sr = librosa.load(audio_path, sr=None, mono=True)
+            # Decoded once and resampled to the analysis rate (cached on disk)
+            y, sr = self.ingest.load(audio_path)
             return y, sr
         except Exception as e:
             print(f"Error loading audio file: {e}")
             return None, None
     
-    def extract_features(self, audio_path):
-        """Extract comprehensive acoustic features from audio file"""
+    def open_session(self, audio_path):
+        """Create an analysis session that decodes and transforms the clip once
+        
+        Pass the session to extract_features and generate_visualizations so both
+        reuse the same decoded signal and spectral representations.
+        """
+        return AnalysisSession(audio_path, self.load_audio, n_fft=self.n_fft, hop_length=self.hop_length)
+    
+    def extract_features(self, audio_path, session=None, feature_set=None):
+        """Extract acoustic features from audio file
+        
+        feature_set selects what to compute: a set name from FEATURE_SETS (e.g.
+        'cognitive'), a group from FEATURE_GROUPS, a single feature name, or a list
+        of these. Dependencies are added automatically. Default: all features.
+        """
         if not self._check_dependencies():
             print("Skipping acoustic feature extraction due to missing dependencies.")
             return {}
+        
+        groups = resolve_feature_groups(feature_set)
+        cache_params = dict(self._cache_params(), groups=groups)
             
+        # Very long recordings are analyzed in bounded memory
+        if self.streaming_threshold is not None:
+            duration = self._file_duration(audio_path)
+            if duration is not None and duration > self.streaming_threshold:
+                features = self.extract_features_streaming(audio_path)
+                wanted = {name for group in groups for name in FEATURE_GROUPS[group]['features']}
+                self.features = {k: v for k, v in features.items() if k in wanted}
+                return self.features
+        
         print("Extracting acoustic features...")
         
+        # Unchanged files hit the cache without being decoded again
+        audio_hash = None
+        if self.cache is not None:
+            audio_hash = self.cache.lookup_file(audio_path)
+            if audio_hash is not None:
+                cached = self.cache.get(audio_hash, cache_params)
+                if cached is not None:
+                    return self._use_cached_features(cached)
+        
         # Load audio
-        y, sr = self.load_audio(audio_path)
+        if session is None:
+            session = self.open_session(audio_path)
+        y, sr = session.y, session.sr
         if y is None:
             return {}
         
-        # Dictionary to store features
+        if self.cache is not None and audio_hash is None:
+            audio_hash = FeatureCache.audio_hash(y, sr)
+            self.cache.remember_file(audio_path, audio_hash)
+            cached = self.cache.get(audio_hash, cache_params)
+            if cached is not None:
+                return self._use_cached_features(cached)
+        
+        self.pitch_track = None
+        # Compute the requested groups; each reads lazily from the shared session
         features = {}
+        for group in groups:
+            try:
+                getattr(self, f'_compute_{group}')(session, features)
+            except Exception:
+                for name in FEATURE_GROUPS[group]['features']:
+                    features[name] = 0
+            
+        # Store features for later use
+        self.features = features
         
-        # Basic audio properties
-        features['duration'] = librosa.get_duration(y=y, sr=sr)
+        if self.cache is not None:
+            self.cache.put(audio_hash, cache_params, features)
         
-        # 1. Pitch/Fundamental Frequency features
-        try:
-            # Extract pitch
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            
-            # Get pitches with highest magnitude
-            pitches_filtered = []
-            for i in range(magnitudes.shape[1]):
-                index = magnitudes[:, i].argmax()
-                pitch = pitches[index, i]
-                if pitch > 0:  # Filter out zero pitches
-                    pitches_filtered.append(pitch)
-            
-            if pitches_filtered:
-                features['pitch_mean'] = np.mean(pitches_filtered)
-                features['pitch_std'] = np.std(pitches_filtered)
-                features['pitch_range'] = np.max(pitches_filtered) - np.min(pitches_filtered)
-                
-                # Pitch variability
-                if len(pitches_filtered) > 1:
-                    pitch_changes = np.diff(pitches_filtered)
-                    features['pitch_variability'] = np.std(pitch_changes)
-                else:
-                    features['pitch_variability'] = 0
-            else:
-                features['pitch_mean'] = 0
-                features['pitch_std'] = 0
-                features['pitch_range'] = 0
-                features['pitch_variability'] = 0
-        except:
-            features['pitch_mean'] = 0
-            features['pitch_std'] = 0
-            features['pitch_range'] = 0
-            features['pitch_variability'] = 0
-        
-        # 2. Voice tremor analysis
-        try:
-            # Amplitude envelope
-            amplitude_envelope = librosa.onset.onset_strength(y=y, sr=sr)
-            # Measure tremor as variability in amplitude envelope
-            if len(amplitude_envelope) > 0:
-                features['tremor_index'] = np.std(amplitude_envelope) / np.mean(amplitude_envelope)
-            else:
-                features['tremor_index'] = 0
-        except:
+        print(f"Extracted {len(features)} acoustic features from audio")
+        return features
+    
+    # Feature groups (see FEATURE_GROUPS); each adds its features to the dict
+    
+    def _compute_duration(self, session, features):
+        """Basic audio properties"""
+        features['duration'] = librosa.get_duration(y=session.y, sr=session.sr)
+    
+    def _compute_pitch(self, session, features):
+        """Pitch/Fundamental Frequency features"""
+        # Per-frame f0, kept for visualizations and later analysis
+        self.pitch_track = session.frontend.pitch_track
+        features.update(pitch_statistics(self.pitch_track))
+    
+    def _compute_tremor(self, session, features):
+        """Voice tremor as variability of the amplitude (onset strength) envelope"""
+        amplitude_envelope = session.frontend.onset_envelope
+        if len(amplitude_envelope) > 0:
+            features['tremor_index'] = np.std(amplitude_envelope) / np.mean(amplitude_envelope)
+        else:
             features['tremor_index'] = 0
-        
-        # 3. Spectral features
-        try:
-            # Spectral centroid
-            cent = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            features['spectral_centroid_mean'] = np.mean(cent)
-            features['spectral_centroid_std'] = np.std(cent)
-            
-            # Spectral bandwidth
-            spec_bw = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-            features['spectral_bandwidth_mean'] = np.mean(spec_bw)
-            
-            # Spectral contrast
-            contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
-            features['spectral_contrast_mean'] = np.mean(contrast)
-            
-            # Spectral flatness
-            flatness = librosa.feature.spectral_flatness(y=y)[0]
-            features['spectral_flatness_mean'] = np.mean(flatness)
-            
-            # Spectral rolloff
-            rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            features['rolloff_mean'] = np.mean(rolloff)
-        except:
-            features['spectral_centroid_mean'] = 0
-            features['spectral_centroid_std'] = 0
-            features['spectral_bandwidth_mean'] = 0
-            features['spectral_contrast_mean'] = 0
-            features['spectral_flatness_mean'] = 0
-            features['rolloff_mean'] = 0
-        
-        # 4. MFCCs (Mel-frequency cepstral coefficients)
+    
+    def _compute_spectral_centroid(self, session, features):
+        cent = librosa.feature.spectral_centroid(S=session.frontend.magnitude, sr=session.sr)[0]
+        features['spectral_centroid_mean'] = np.mean(cent)
+        features['spectral_centroid_std'] = np.std(cent)
+    
+    def _compute_spectral_bandwidth(self, session, features):
+        spec_bw = librosa.feature.spectral_bandwidth(S=session.frontend.magnitude, sr=session.sr)[0]
+        features['spectral_bandwidth_mean'] = np.mean(spec_bw)
+    
+    def _compute_spectral_contrast(self, session, features):
+        contrast = librosa.feature.spectral_contrast(S=session.frontend.magnitude, sr=session.sr)
+        features['spectral_contrast_mean'] = np.mean(contrast)
+    
+    def _compute_spectral_flatness(self, session, features):
+        flatness = librosa.feature.spectral_flatness(S=session.frontend.magnitude)[0]
+        features['spectral_flatness_mean'] = np.mean(flatness)
+    
+    def _compute_spectral_rolloff(self, session, features):
+        rolloff = librosa.feature.spectral_rolloff(S=session.frontend.magnitude, sr=session.sr)[0]
+        features['rolloff_mean'] = np.mean(rolloff)
+    
+    def _compute_mfcc(self, session, features):
+        """MFCCs (Mel-frequency cepstral coefficients)"""
+        mfccs = session.frontend.mfcc
+        for i in range(13):
+            features[f'mfcc{i+1}_mean'] = np.mean(mfccs[i])
+            features[f'mfcc{i+1}_std'] = np.std(mfccs[i])
+    
+    def _compute_tempo(self, session, features):
+        features['tempo'] = self._tempo(session.frontend.onset_envelope, session.sr)
+    
+    def _compute_rhythm(self, session, features):
+        features['rhythm_strength'] = self._rhythm_strength(session.frontend.onset_envelope)
+    
+    def _compute_zero_crossing_rate(self, session, features):
+        """Zero crossing rate (related to voice hoarseness)"""
+        zcr = librosa.feature.zero_crossing_rate(
+            session.y, frame_length=self.n_fft, hop_length=self.hop_length)[0]
+        features['zero_crossing_rate_mean'] = np.mean(zcr)
+        features['zero_crossing_rate_std'] = np.std(zcr)
+    
+    def _compute_rms(self, session, features):
+        """RMS energy (related to loudness)"""
+        rms = librosa.feature.rms(y=session.y, frame_length=self.n_fft, hop_length=self.hop_length)[0]
+        features['rms_mean'] = np.mean(rms)
+        features['rms_std'] = np.std(rms)
+    
+    def _compute_harmonic_ratio(self, session, features):
+        """Harmonics-to-noise ratio (estimate via spectral flatness)"""
+        features['harmonic_ratio'] = 1.0 - features['spectral_flatness_mean']
+    
+    def _tempo(self, onset_env, sr):
+        """Tempo estimate from an onset strength envelope"""
+        return librosa.beat.tempo(onset_envelope=onset_env, sr=sr,
+                                  hop_length=self.hop_length)[0]
+    
+    def _rhythm_strength(self, onset_env):
+        """Rhythm regularity from the autocorrelation of onset strength"""
+        ac = librosa.autocorrelate(onset_env, max_size=len(onset_env))
+        # Normalize
+        ac = librosa.util.normalize(ac, norm=np.inf)
+        # Take second peak (first is at lag 0)
+        peaks = librosa.util.peak_pick(ac, pre_max=10, post_max=10, pre_avg=10, post_avg=10, delta=0.5, wait=1)
+        return ac[peaks[0]] if len(peaks) > 0 else 0
+    
+    def _file_duration(self, audio_path):
+        """Duration in seconds from the file header, or None if it cannot be read"""
+        if not SOUNDFILE_AVAILABLE:
+            return None
         try:
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            for i in range(13):
-                features[f'mfcc{i+1}_mean'] = np.mean(mfccs[i])
-                features[f'mfcc{i+1}_std'] = np.std(mfccs[i])
-        except:
-            for i in range(13):
-                features[f'mfcc{i+1}_mean'] = 0
-                features[f'mfcc{i+1}_std'] = 0
-        
-        # 5. Speech rhythm features
+            return sf.info(str(audio_path)).duration
+        except Exception:
+            return None
+    
+    def extract_features_streaming(self, audio_path, block_seconds=30.0):
+        """Extract acoustic features from a long recording in bounded memory
+        
+        The file is read in blocks of block_seconds and every per-frame measure is
+        folded into running accumulators, so memory depends on the block size and
+        not on the recording length. Frame statistics match extract_features apart
+        from frames at block edges; tempo and rhythm strength are averaged over
+        blocks, since they are only defined on a bounded onset envelope.
+        """
+        if not self._check_dependencies() or not SOUNDFILE_AVAILABLE:
+            print("Skipping acoustic feature extraction due to missing dependencies.")
+            return {}
+        
+        print("Extracting acoustic features (streaming)...")
+        params = dict(self._cache_params(), streaming=True, block_seconds=block_seconds)
+        
+        if self.cache is not None:
+            audio_hash = self.cache.lookup_file(audio_path)
+            if audio_hash is not None:
+                cached = self.cache.get(audio_hash, params)
+                if cached is not None:
+                    return self._use_cached_features(cached)
+        
         try:
-            # Tempo estimation
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-            tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
-            features['tempo'] = tempo
-            
-            # Rhythm regularity
-            # Use autocorrelation of onset strength
-            ac = librosa.autocorrelate(onset_env, max_size=len(onset_env))
-            # Normalize
-            ac = librosa.util.normalize(ac, norm=np.inf)
-            # Take second peak (first is at lag 0)
-            peaks = librosa.util.peak_pick(ac, pre_max=10, post_max=10, pre_avg=10, post_avg=10, delta=0.5, wait=1)
-            if len(peaks) > 0:
-                features['rhythm_strength'] = ac[peaks[0]]
-            else:
-                features['rhythm_strength'] = 0
-        except:
-            features['tempo'] = 0
-            features['rhythm_strength'] = 0
-        
-        # 6. Voice quality measures
+            native_sr = sf.info(str(audio_path)).samplerate
+        except Exception as e:
+            print(f"Error loading audio file: {e}")
+            return {}
+        sr = self.ingest.sample_rate or native_sr
+        
+        # Whole number of hops per block, counted at the analysis rate the blocks
+        # are resampled to, keeps the frame grid continuous across blocks
+        block_frames = max(self.n_fft, int(block_seconds * sr) // self.hop_length * self.hop_length)
+        digest = FeatureCache.audio_digest(sr)
+        
+        names = ['pitch', 'pitch_change', 'onset', 'centroid', 'bandwidth', 'contrast',
+                 'flatness', 'rolloff', 'mfcc', 'tempo', 'rhythm', 'zcr', 'rms']
+        stats = {name: RunningStats() for name in names}
+        total_samples = 0
+        last_pitch = None
+        
         try:
-            # Zero crossing rate (related to voice hoarseness)
-            zcr = librosa.feature.zero_crossing_rate(y)[0]
-            features['zero_crossing_rate_mean'] = np.mean(zcr)
-            features['zero_crossing_rate_std'] = np.std(zcr)
-            
-            # RMS energy (related to loudness)
-            rms = librosa.feature.rms(y=y)[0]
-            features['rms_mean'] = np.mean(rms)
-            features['rms_std'] = np.std(rms)
-            
-            # Harmonics-to-noise ratio (estimate via spectral flatness)
-            features['harmonic_ratio'] = 1.0 - features['spectral_flatness_mean']
-        except:
-            features['zero_crossing_rate_mean'] = 0
-            features['zero_crossing_rate_std'] = 0
-            features['rms_mean'] = 0
-            features['rms_std'] = 0
-            features['harmonic_ratio'] = 0
-            
-        # Store features for later use
+            for y in read_mono_blocks(audio_path, block_frames, sr, self.ingest.resampler):
+                digest.update(y.tobytes())
+                total_samples += len(y)
+                
+                stats['zcr'].update(librosa.feature.zero_crossing_rate(
+                    y, frame_length=self.n_fft, hop_length=self.hop_length)[0])
+                stats['rms'].update(librosa.feature.rms(
+                    y=y, frame_length=self.n_fft, hop_length=self.hop_length)[0])
+                
+                # Too short for a full analysis window (tail of the file)
+                if len(y) < self.n_fft:
+                    continue
+                
+                frontend = SpectralFrontend(y, sr, n_fft=self.n_fft, hop_length=self.hop_length)
+                S = frontend.magnitude
+                
+                voiced = frontend.pitch_track[frontend.pitch_track > 0]
+                if len(voiced) > 0:
+                    stats['pitch'].update(voiced)
+                    # Carry the last voiced pitch so changes across block edges count
+                    track = voiced if last_pitch is None else np.concatenate(([last_pitch], voiced))
+                    stats['pitch_change'].update(np.diff(track))
+                    last_pitch = voiced[-1]
+                
+                stats['onset'].update(frontend.onset_envelope)
+                stats['centroid'].update(librosa.feature.spectral_centroid(S=S, sr=sr)[0])
+                stats['bandwidth'].update(librosa.feature.spectral_bandwidth(S=S, sr=sr)[0])
+                stats['contrast'].update(librosa.feature.spectral_contrast(S=S, sr=sr).ravel())
+                stats['flatness'].update(librosa.feature.spectral_flatness(S=S)[0])
+                stats['rolloff'].update(librosa.feature.spectral_rolloff(S=S, sr=sr)[0])
+                stats['mfcc'].update(frontend.mfcc)
+                
+                try:
+                    stats['tempo'].update([self._tempo(frontend.onset_envelope, sr)])
+                    stats['rhythm'].update([self._rhythm_strength(frontend.onset_envelope)])
+                except Exception:
+                    pass
+        except Exception as e:
+            print(f"Error during streaming analysis: {e}")
+            return {}
+        
+        features = {'duration': total_samples / sr}
+        
+        # 1. Pitch
+        features['pitch_mean'] = stats['pitch'].mean
+        features['pitch_std'] = stats['pitch'].std
+        features['pitch_range'] = stats['pitch'].range
+        features['pitch_variability'] = stats['pitch_change'].std
+        
+        # 2. Voice tremor
+        onset = stats['onset']
+        features['tremor_index'] = onset.std / onset.mean if onset.count and onset.mean else 0
+        
+        # 3. Spectral features
+        features['spectral_centroid_mean'] = stats['centroid'].mean
+        features['spectral_centroid_std'] = stats['centroid'].std
+        features['spectral_bandwidth_mean'] = stats['bandwidth'].mean
+        features['spectral_contrast_mean'] = stats['contrast'].mean
+        features['spectral_flatness_mean'] = stats['flatness'].mean
+        features['rolloff_mean'] = stats['rolloff'].mean
+        
+        # 4. MFCCs
+        mfcc = stats['mfcc']
+        for i in range(13):
+            features[f'mfcc{i+1}_mean'] = mfcc.mean[i] if mfcc.count else 0
+            features[f'mfcc{i+1}_std'] = mfcc.std[i] if mfcc.count else 0
+        
+        # 5. Speech rhythm
+        features['tempo'] = stats['tempo'].mean
+        features['rhythm_strength'] = stats['rhythm'].mean
+        
+        # 6. Voice quality
+        features['zero_crossing_rate_mean'] = stats['zcr'].mean
+        features['zero_crossing_rate_std'] = stats['zcr'].std
+        features['rms_mean'] = stats['rms'].mean
+        features['rms_std'] = stats['rms'].std
+        features['harmonic_ratio'] = 1.0 - features['spectral_flatness_mean']
+        
+        features = {k: float(v) for k, v in features.items()}
         self.features = features
+        self.pitch_track = None
         
-        print(f"Extracted {len(features)} acoustic features from audio")
+        if self.cache is not None:
+            audio_hash = digest.hexdigest()
+            self.cache.remember_file(audio_path, audio_hash)
+            self.cache.put(audio_hash, params, features)
+        
+        print(f"Extracted {len(features)} acoustic features from {features['duration']:.0f}s of audio")
         return features
     
-    def generate_visualizations(self, audio_path, output_dir=None):
-        """Generate visualizations of acoustic features"""
+    def _use_cached_features(self, features):
+        """Adopt features returned by the cache"""
+        self.features = features
+        self.pitch_track = None
+        print(f"Loaded {len(features)} cached acoustic features")
+        return features
+    
+    def extract_features_batch(self, audio_paths, workers=None):
+        """Extract acoustic features for many clips using a process pool
+        
+        Returns a DataFrame with one row per input path, in input order. A clip
+        that fails keeps its row, with the failure recorded in the 'error' column.
+        """
+        audio_paths = [str(path) for path in audio_paths]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        rows = [None] * len(audio_paths)
+        if workers <= 1 or len(audio_paths) <= 1:
+            for i, path in enumerate(audio_paths):
+                rows[i] = _extract_features_worker(path, self._settings())
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(audio_paths))) as executor:
+                futures = {
+                    executor.submit(_extract_features_worker, path, self._settings()): i
+                    for i, path in enumerate(audio_paths)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        rows[i] = future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. killed by the OS)
+                        rows[i] = {'error': f"{type(e).__name__}: {e}"}
+        
+        results = pd.DataFrame(rows, index=range(len(audio_paths)))
+        if 'error' not in results.columns:
+            results['error'] = None
+        results.insert(0, 'audio_path', audio_paths)
+        
+        failed = results['error'].notna().sum()
+        print(f"Extracted acoustic features for {len(audio_paths) - failed}/{len(audio_paths)} clips")
+        return results
+    
+    def generate_visualizations(self, audio_path, output_dir=None, session=None):
+        """Generate visualizations of acoustic features
+        
+        With the session used for extract_features, the plots reuse its decoded
+        signal and spectral representations instead of recomputing them.
+        """
         if not self._check_dependencies():
             return None
             
-        y, sr = self.load_audio(audio_path)
+        if session is None:
+            session = self.open_session(audio_path)
+        y, sr = session.y, session.sr
         if y is None:
             return None
+        frontend = session.frontend
             
         if output_dir is None:
             output_dir = Path("reports/acoustic_analysis")
@@ -226,34 +533,39 @@ class AcousticAnalyzer:
         librosa.display.waveshow(y, sr=sr, ax=axes[0, 0])
         axes[0, 0].set_title('Waveform')
         
-        # 2. Spectrogram
-        D = librosa.amplitude_to_db(np.abs(librosa.stft(y)), ref=np.max)
-        img = librosa.display.specshow(D, y_axis='log', x_axis='time', ax=axes[0, 1])
+        # 2. Spectrogram with pitch contour
+        D = librosa.amplitude_to_db(frontend.magnitude, ref=np.max)
+        img = librosa.display.specshow(D, sr=sr, hop_length=self.hop_length,
+                                       y_axis='log', x_axis='time', ax=axes[0, 1])
+        f0 = np.where(frontend.pitch_track > 0, frontend.pitch_track, np.nan)
+        axes[0, 1].plot(librosa.times_like(f0, sr=sr, hop_length=self.hop_length), f0,
+                        color='cyan', linewidth=1, label='f0')
         axes[0, 1].set_title('Spectrogram')
         fig.colorbar(img, ax=axes[0, 1], format='%+2.0f dB')
         
         # 3. Mel Spectrogram
-        S = librosa.feature.melspectrogram(y=y, sr=sr)
-        S_dB = librosa.power_to_db(S, ref=np.max)
-        img = librosa.display.specshow(S_dB, x_axis='time', y_axis='mel', ax=axes[1, 0])
+        S_dB = librosa.power_to_db(frontend.mel, ref=np.max)
+        img = librosa.display.specshow(S_dB, sr=sr, hop_length=self.hop_length,
+                                       x_axis='time', y_axis='mel', ax=axes[1, 0])
         axes[1, 0].set_title('Mel Spectrogram')
         fig.colorbar(img, ax=axes[1, 0], format='%+2.0f dB')
         
         # 4. Chroma Features
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-        img = librosa.display.specshow(chroma, y_axis='chroma', x_axis='time', ax=axes[1, 1])
+        chroma = librosa.feature.chroma_stft(S=frontend.power, sr=sr, n_fft=self.n_fft)
+        img = librosa.display.specshow(chroma, sr=sr, hop_length=self.hop_length,
+                                       y_axis='chroma', x_axis='time', ax=axes[1, 1])
         axes[1, 1].set_title('Chromagram')
         fig.colorbar(img, ax=axes[1, 1])
         
         # 5. MFCCs
-        mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-        img = librosa.display.specshow(mfccs, x_axis='time', ax=axes[2, 0])
+        img = librosa.display.specshow(frontend.mfcc, sr=sr, hop_length=self.hop_length,
+                                       x_axis='time', ax=axes[2, 0])
         axes[2, 0].set_title('MFCCs')
         fig.colorbar(img, ax=axes[2, 0])
         
         # 6. Onset Strength
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        times = librosa.times_like(onset_env, sr=sr)
+        onset_env = frontend.onset_envelope
+        times = librosa.times_like(onset_env, sr=sr, hop_length=self.hop_length)
         axes[2, 1].plot(times, onset_env, label='Onset Strength')
         axes[2, 1].set_title('Onset Strength')
         axes[2, 1].set_xlabel('Time (s)')
@@ -262,11 +574,19 @@ class AcousticAnalyzer:
         plt.tight_layout()
         timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
         plt.savefig(os.path.join(output_dir, f'acoustic_analysis_{timestamp}.png'))
+        plt.close(fig)
         
         return os.path.join(output_dir, f'acoustic_analysis_{timestamp}.png')
     
-    def get_cognitive_indicators(self):
-        """Extract cognitive health indicators from acoustic features"""
+    def get_cognitive_indicators(self, audio_path=None, session=None):
+        """Extract cognitive health indicators from acoustic features
+        
+        Uses the features from the last extract_features call, or, given an
+        audio_path, extracts just the 'cognitive' feature set first.
+        """
+        if audio_path is not None:
+            self.extract_features(audio_path, session=session, feature_set='cognitive')
+        
         if not self.features:
             return {}
             
@@ -315,3 +635,18 @@ class AcousticAnalyzer:
                 normalized[key] = max(0, min(1, 1 - (value / 2)))
                 
         return normalized
+
+
+def _extract_features_worker(audio_path, settings):
+    """Extract features for a single clip (process pool entry point)"""
+    try:
+        features = AcousticAnalyzer(**settings).extract_features(audio_path)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+    
+    if not features:
+        return {'error': 'Could not load audio or acoustic analysis unavailable'}
+    
+    row = dict(features)
+    row['error'] = None
+    return row
@@ -0,0 +1,43 @@
+from functools import cached_property
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.data_processing.spectral_frontend import SpectralFrontend
+
+
+class AnalysisSession:
+    """Decoded audio and its intermediate representations for one clip
+
+    Feature extraction and visualization both read from the same session, so
+    the file is decoded once and the STFT, mel spectrogram, MFCCs, onset
+    envelope and pitch track are computed once per assessment. Everything is
+    loaded lazily: a session whose features come from the cache never decodes.
+    """
+
+    def __init__(self, audio_path, loader, n_fft=2048, hop_length=512):
+        """Create a session; loader(audio_path) must return (y, sr) or (None, None)"""
+        self.audio_path = audio_path
+        self._loader = loader
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+
+    @cached_property
+    def _audio(self):
+        return self._loader(self.audio_path)
+
+    @property
+    def y(self):
+        """Decoded mono signal (None if the file could not be loaded)"""
+        return self._audio[0]
+
+    @property
+    def sr(self):
+        """Sample rate of the decoded signal"""
+        return self._audio[1]
+
+    @cached_property
+    def frontend(self):
+        """Shared spectral front-end for the decoded signal"""
+        return SpectralFrontend(self.y, self.sr, n_fft=self.n_fft, hop_length=self.hop_length)
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import sys
+import threading
+import numpy as np
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from config import SAMPLE_RATE
+
+# Try importing librosa
+try:
+    import librosa
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+
+# Resamplers accepted by librosa.resample; soxr_qq and polyphase are the fastest
+RESAMPLERS = ['soxr_vhq', 'soxr_hq', 'soxr_mq', 'soxr_lq', 'soxr_qq',
+              'kaiser_best', 'kaiser_fast', 'polyphase']
+
+# Decoded cache location for the CLI and batch runs, which re-analyze the same clips
+DEFAULT_DECODED_CACHE_DIR = Path("data/cache/decoded")
+
+class AudioIngest:
+    """Decode audio once to mono float32 at a fixed analysis sample rate
+
+    Every downstream consumer gets the same rate regardless of how the clip
+    was recorded (e.g. 44.1 kHz from the voice analyzer), so feature cost no
+    longer scales with the recording rate. With a cache_dir, decoded clips are
+    kept as .npy files keyed by the clip's path, size and mtime plus the
+    target rate and resampler, so re-analysis of an unchanged clip skips
+    decoding and resampling; the cache is trimmed to max_cache_bytes, oldest
+    first. It is off by default: one-off uploads (as in the API) would only
+    fill it with copies that are never read again.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, resampler='soxr_hq', cache_dir=None,
+                 max_cache_bytes=1024 * 1024 * 1024):
+        """Configure the ingest stage
+
+        sample_rate=None keeps each file's native rate; cache_dir=None (the
+        default) disables the decoded cache.
+        """
+        if resampler not in RESAMPLERS:
+            raise ValueError(f"Unknown resampler '{resampler}', choose from {RESAMPLERS}")
+
+        self.sample_rate = sample_rate
+        self.resampler = resampler
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_cache_bytes = max_cache_bytes
+
+    def _cache_key(self, audio_path):
+        """Key for the decoded copy of the clip as it is currently on disk"""
+        path = Path(audio_path).resolve()
+        stat = path.stat()
+        key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{self.sample_rate}|{self.resampler}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def load(self, audio_path):
+        """Return (y, sr): mono float32 signal at the analysis sample rate"""
+        key = None
+        if self.cache_dir is not None and self.max_cache_bytes:
+            key = self._cache_key(audio_path)
+            # The sample rate is part of the file name: <key>_<sr>.npy
+            for cache_path in self.cache_dir.glob(f"{key}_*.npy"):
+                try:
+                    os.utime(cache_path)  # Mark as recently used
+                    return np.load(cache_path), int(cache_path.stem.rsplit('_', 1)[1])
+                except (OSError, ValueError):
+                    break  # Evicted or unreadable; decode again
+
+        y, sr = librosa.load(audio_path, sr=None, mono=True)
+        if self.sample_rate is not None and sr != self.sample_rate:
+            y = librosa.resample(y, orig_sr=sr, target_sr=self.sample_rate, res_type=self.resampler)
+            sr = self.sample_rate
+        y = np.ascontiguousarray(y, dtype=np.float32)
+
+        if key is not None:
+            self._store(self.cache_dir / f"{key}_{sr}.npy", y)
+        return y, sr
+
+    def _store(self, cache_path, y):
+        """Write a decoded clip and trim the cache to max_cache_bytes"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so readers never see a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, y)
+        os.replace(tmp_path, cache_path)
+
+        entries = []
+        for entry in self.cache_dir.glob("*.npy"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # Removed by another worker
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_cache_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
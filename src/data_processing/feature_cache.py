@@ -0,0 +1,211 @@
+# Vendored as src/data_processing/feature_cache.py and speech_intelligence/src/feature_cache.py, whose
+# src packages can't import each other; tests/data_processing/test_vendored_modules.py
+# fails if the copies differ
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from pathlib import Path
+
+# Every cached row with the bytes it counts towards max_bytes: an entry's
+# payload, or a file hash's path and hash plus its two integers
+_SIZED_ROWS = '''
+SELECT 'entry' AS kind, cache_key AS key, size, last_access FROM entries
+UNION ALL
+SELECT 'file', path, LENGTH(path) + LENGTH(audio_hash) + 16, last_access FROM file_hashes
+'''
+
+class FeatureCache:
+    """Persistent, size-bounded LRU cache of extracted features
+
+    Entries are keyed by the content hash of the decoded audio together with
+    the extractor parameters and version, so a re-run, a retried upload or a
+    copy of the same recording under another name all hit the same entry.
+    A second table remembers which audio hash a file had at a given mtime and
+    size, so repeated hits on an unchanged file skip decoding entirely. Its
+    rows count towards max_bytes and are evicted with the entries, so paths
+    seen only once (e.g. per-request uploads) do not accumulate.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024, namespace='features'):
+        """Open (or create) the cache database in cache_dir"""
+        if cache_dir is None:
+            cache_dir = Path("data/cache/features")
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def __getstate__(self):
+        # The sqlite connection cannot cross process boundaries; workers reopen it
+        return {'cache_dir': self.cache_dir, 'max_bytes': self.max_bytes,
+                'namespace': self.namespace}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _connection(self):
+        """Open the cache database on first use"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.cache_dir / f"{self.namespace}.db",
+                                   timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                cache_key TEXT PRIMARY KEY,
+                payload TEXT,
+                size INTEGER,
+                last_access REAL
+            )
+            ''')
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER,
+                audio_hash TEXT,
+                last_access REAL
+            )
+            ''')
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(file_hashes)")]
+            if 'last_access' not in columns:  # Created before file hashes were evicted
+                conn.execute("ALTER TABLE file_hashes ADD COLUMN last_access REAL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def audio_hash(y, sr):
+        """Content hash of a decoded signal and its sample rate"""
+        digest = FeatureCache.audio_digest(sr)
+        digest.update(np.ascontiguousarray(y).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def audio_digest(sr):
+        """Incremental hasher matching audio_hash, for signals read in blocks"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(int(sr)).encode())
+        return digest
+
+    @staticmethod
+    def text_hash(text):
+        """Content hash of a piece of text (e.g. a transcript)"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _cache_key(audio_hash, params):
+        params_json = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.blake2b(f"{audio_hash}|{params_json}".encode(), digest_size=16).hexdigest()
+
+    def lookup_file(self, path):
+        """Return the known audio hash of a file if it is unchanged on disk, else None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        resolved = str(Path(path).resolve())
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT mtime_ns, size, audio_hash FROM file_hashes WHERE path = ?",
+                               (resolved,)).fetchone()
+            if not (row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size):
+                return None
+
+            conn.execute("UPDATE file_hashes SET last_access = ? WHERE path = ?", (time.time(), resolved))
+            conn.commit()
+        return row[2]
+
+    def remember_file(self, path, audio_hash):
+        """Record the audio hash of a file at its current mtime and size"""
+        stat = os.stat(path)
+        with self._lock:
+            conn = self._connection()
+            conn.execute('''
+            INSERT OR REPLACE INTO file_hashes (path, mtime_ns, size, audio_hash, last_access)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size, audio_hash, time.time()))
+            self._evict(conn)
+            conn.commit()
+
+    def get(self, audio_hash, params):
+        """Return cached features for this audio and parameters, or None"""
+        key = self._cache_key(audio_hash, params)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT payload FROM entries WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE entries SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+            conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, audio_hash, params, features):
+        """Store features and evict least recently used entries over max_bytes"""
+        payload = json.dumps({k: _to_builtin(v) for k, v in features.items()})
+        key = self._cache_key(audio_hash, params)
+        with self._lock:
+            conn = self._connection()
+            conn.execute('''
+            INSERT OR REPLACE INTO entries (cache_key, payload, size, last_access)
+            VALUES (?, ?, ?, ?)
+            ''', (key, payload, len(payload), time.time()))
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        """Keep the most recently used entries and file hashes that fit in max_bytes"""
+        evicted = conn.execute(f'''
+        SELECT kind, key FROM (
+            SELECT kind, key, SUM(size) OVER (ORDER BY last_access DESC) AS running_size
+            FROM ({_SIZED_ROWS})
+        ) WHERE running_size > ?
+        ''', (self.max_bytes,)).fetchall()
+        conn.executemany("DELETE FROM entries WHERE cache_key = ?",
+                         [(key,) for kind, key in evicted if kind == 'entry'])
+        conn.executemany("DELETE FROM file_hashes WHERE path = ?",
+                         [(key,) for kind, key in evicted if kind == 'file'])
+
+    def stats(self):
+        """Hit/miss counters for this instance and current cache size"""
+        with self._lock:
+            entries, size = self._connection().execute(f'''
+            SELECT COUNT(*) FILTER (WHERE kind = 'entry'), COALESCE(SUM(size), 0)
+            FROM ({_SIZED_ROWS})
+            ''').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0,
+            'entries': entries,
+            'size_bytes': size
+        }
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM file_hashes")
+            conn.commit()
+
+def _to_builtin(value):
+    """Convert numpy scalars to plain Python values for JSON"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
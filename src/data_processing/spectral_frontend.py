@@ -0,0 +1,90 @@
+import numpy as np
+from functools import cached_property
+
+# Try importing librosa
+try:
+    import librosa
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+
+
+class SpectralFrontend:
+    """Shared spectral representations of a single audio clip
+
+    The STFT, mel filterbank and the representations derived from them are
+    computed at most once per clip and reused by every feature, instead of
+    each librosa feature call running its own transform.
+    """
+
+    def __init__(self, y, sr, n_fft=2048, hop_length=512, n_mels=128, n_mfcc=13):
+        """Initialize the front-end for a mono signal"""
+        self.y = y
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+
+    @cached_property
+    def magnitude(self):
+        """Magnitude spectrogram |STFT|"""
+        return np.abs(librosa.stft(self.y, n_fft=self.n_fft, hop_length=self.hop_length))
+
+    @cached_property
+    def power(self):
+        """Power spectrogram |STFT|^2"""
+        return self.magnitude ** 2
+
+    @cached_property
+    def mel_basis(self):
+        """Mel filterbank matching the STFT size"""
+        return librosa.filters.mel(sr=self.sr, n_fft=self.n_fft, n_mels=self.n_mels)
+
+    @cached_property
+    def mel(self):
+        """Mel power spectrogram"""
+        return self.mel_basis @ self.power
+
+    @cached_property
+    def mel_db(self):
+        """Log-power mel spectrogram (dB)"""
+        return librosa.power_to_db(self.mel)
+
+    @cached_property
+    def mfcc(self):
+        """Mel-frequency cepstral coefficients"""
+        return librosa.feature.mfcc(S=self.mel_db, n_mfcc=self.n_mfcc)
+
+    @cached_property
+    def pitch_track(self):
+        """Per-frame fundamental frequency in Hz (0 where no pitch was found)
+
+        Picks, for every frame, the piptrack candidate with the largest
+        magnitude using whole-array indexing instead of a per-frame loop.
+        """
+        pitches, magnitudes = librosa.piptrack(S=self.magnitude, sr=self.sr)
+        best_bins = magnitudes.argmax(axis=0)
+        return pitches[best_bins, np.arange(pitches.shape[1])]
+
+    @cached_property
+    def onset_envelope(self):
+        """Onset strength envelope (spectral flux of the log-mel spectrogram)"""
+        return librosa.onset.onset_strength(S=self.mel_db, sr=self.sr,
+                                            n_fft=self.n_fft,
+                                            hop_length=self.hop_length)
+
+
+def pitch_statistics(f0):
+    """Summary statistics of the voiced frames of a pitch track"""
+    voiced = f0[f0 > 0]
+    if len(voiced) == 0:
+        return {'pitch_mean': 0, 'pitch_std': 0, 'pitch_range': 0, 'pitch_variability': 0}
+
+    return {
+        'pitch_mean': np.mean(voiced),
+        'pitch_std': np.std(voiced),
+        'pitch_range': np.ptp(voiced),
+        # Variability of frame-to-frame pitch changes
+        'pitch_variability': np.std(np.diff(voiced)) if len(voiced) > 1 else 0
+    }
@@ -0,0 +1,122 @@
+import numpy as np
+
+# Try importing soundfile for block reads
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+# soxr (a librosa dependency) resamples a stream without block-edge artifacts
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+
+
+class RunningStats:
+    """Running mean, standard deviation, minimum and maximum
+
+    Works on batches of values and merges them with Chan's parallel update,
+    so statistics over an arbitrarily long stream need constant memory.
+    For 2-D batches one set of statistics is kept per row (e.g. per MFCC
+    coefficient), with frames along the last axis.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Add a batch of values (1-D, or 2-D with one row per statistic)"""
+        values = np.asarray(values, dtype=np.float64)
+        n = values.shape[-1]
+        if n == 0:
+            return
+
+        batch_mean = values.mean(axis=-1)
+        batch_m2 = ((values - np.expand_dims(batch_mean, -1)) ** 2).sum(axis=-1)
+
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = np.minimum(self.min, values.min(axis=-1))
+        self.max = np.maximum(self.max, values.max(axis=-1))
+
+    @property
+    def std(self):
+        """Population standard deviation (matches np.std)"""
+        if self.count == 0:
+            return 0.0
+        return np.sqrt(self.m2 / self.count)
+
+    @property
+    def range(self):
+        if self.count == 0:
+            return 0.0
+        return self.max - self.min
+
+
+def read_mono_blocks(audio_path, block_frames, target_sr=None, resampler='soxr_hq'):
+    """Yield consecutive mono float32 blocks of the file
+
+    Blocks hold block_frames samples at target_sr (default: the file's native
+    rate). Resampled output is re-blocked, so every block but the last has
+    exactly block_frames samples and frame grids laid on the blocks line up.
+    """
+    with sf.SoundFile(str(audio_path)) as audio_file:
+        native_sr = audio_file.samplerate
+        target_sr = target_sr or native_sr
+        block_resampler = BlockResampler(native_sr, target_sr, resampler)
+        read_frames = max(1, int(np.ceil(block_frames * native_sr / target_sr)))
+
+        pending = np.zeros(0, dtype='float32')
+        for block in audio_file.blocks(blocksize=read_frames, dtype='float32', always_2d=True):
+            pending = np.concatenate((pending, block_resampler.process(block.mean(axis=1, dtype='float32'))))
+            while len(pending) >= block_frames:
+                yield pending[:block_frames]
+                pending = pending[block_frames:]
+
+        # Flush samples still held by a stateful resampler
+        pending = np.concatenate((pending, block_resampler.process(np.zeros(0, dtype='float32'), last=True)))
+        while len(pending) > 0:
+            yield pending[:block_frames]
+            pending = pending[block_frames:]
+
+
+class BlockResampler:
+    """Resample consecutive blocks of one stream to a target sample rate
+
+    soxr resamplers keep filter state between blocks, so the output matches
+    resampling the whole signal. Other resamplers fall back to resampling
+    each block independently with librosa.
+    """
+
+    SOXR_QUALITY = {'soxr_vhq': 'VHQ', 'soxr_hq': 'HQ', 'soxr_mq': 'MQ',
+                    'soxr_lq': 'LQ', 'soxr_qq': 'QQ'}
+
+    def __init__(self, orig_sr, target_sr, resampler='soxr_hq'):
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self.resampler = resampler
+        self._stream = None
+        if SOXR_AVAILABLE and resampler in self.SOXR_QUALITY and orig_sr != target_sr:
+            self._stream = soxr.ResampleStream(orig_sr, target_sr, 1, dtype='float32',
+                                               quality=self.SOXR_QUALITY[resampler])
+
+    def process(self, block, last=False):
+        """Resample one block; pass last=True for the final block to flush"""
+        if self.orig_sr == self.target_sr or (self._stream is None and len(block) == 0):
+            return block
+        if self._stream is not None:
+            return self._stream.resample_chunk(block, last=last)
+
+        import librosa
+        return librosa.resample(block, orig_sr=self.orig_sr, target_sr=self.target_sr,
+                                res_type=self.resampler)
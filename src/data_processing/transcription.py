@@ -0,0 +1,191 @@
+# Vendored as src/data_processing/transcription.py and speech_intelligence/src/transcription.py, whose
+# src packages can't import each other; tests/data_processing/test_vendored_modules.py
+# fails if the copies differ
+import hashlib
+import json
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from .feature_cache import FeatureCache
+
+# Try importing speech_recognition
+try:
+    import speech_recognition as sr
+    SPEECH_RECOGNITION_AVAILABLE = True
+except ImportError:
+    SPEECH_RECOGNITION_AVAILABLE = False
+
+
+class TranscriptionBackend:
+    """Speech-to-text engine behind a common interface
+
+    transcribe(audio_data) takes a speech_recognition.AudioData and returns
+    the transcript. It raises speech_recognition.UnknownValueError when no
+    speech is recognized and RequestError when the engine is unavailable.
+    """
+
+    name = None
+
+    def transcribe(self, audio_data):
+        raise NotImplementedError
+
+
+class GoogleBackend(TranscriptionBackend):
+    """Google Web Speech API (one network request per call)"""
+
+    name = 'google'
+
+    def __init__(self, language='en-US'):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio_data):
+        return self.recognizer.recognize_google(audio_data, language=self.language)
+
+
+class SphinxBackend(TranscriptionBackend):
+    """CMU Sphinx running locally (requires pocketsphinx, no network)"""
+
+    name = 'sphinx'
+
+    def __init__(self, language='en-US'):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio_data):
+        return self.recognizer.recognize_sphinx(audio_data, language=self.language)
+
+
+class WhisperBackend(TranscriptionBackend):
+    """OpenAI Whisper running locally (requires openai-whisper, no network)"""
+
+    name = 'whisper'
+
+    def __init__(self, model='base', language='english'):
+        self.model = model
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio_data):
+        return self.recognizer.recognize_whisper(audio_data, model=self.model,
+                                                 language=self.language).strip()
+
+
+class FixtureBackend(TranscriptionBackend):
+    """Deterministic stand-in for tests and benchmarks
+
+    Transcripts are looked up by the content hash of the audio (see
+    audio_key) in a dict or a JSON fixture file; unknown audio gets
+    default. latency simulates the round-trip of a remote engine.
+    """
+
+    name = 'fixture'
+
+    def __init__(self, fixtures=None, default="", latency=0.0):
+        if isinstance(fixtures, (str, Path)):
+            with open(fixtures) as f:
+                fixtures = json.load(f)
+        self.fixtures = fixtures or {}
+        self.default = default
+        self.latency = latency
+
+    @staticmethod
+    def audio_key(audio_data):
+        """Fixture key of a clip: hash of its PCM bytes and sample rate"""
+        digest = hashlib.blake2b(audio_data.get_raw_data(), digest_size=16)
+        digest.update(str(audio_data.sample_rate).encode())
+        return digest.hexdigest()
+
+    def transcribe(self, audio_data):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.fixtures.get(self.audio_key(audio_data), self.default)
+
+
+TRANSCRIPTION_BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    SphinxBackend.name: SphinxBackend,
+    WhisperBackend.name: WhisperBackend,
+    FixtureBackend.name: FixtureBackend,
+}
+
+
+def get_transcription_backend(backend='google'):
+    """Return a TranscriptionBackend for a name (instances are passed through)"""
+    if isinstance(backend, TranscriptionBackend):
+        return backend
+    if backend not in TRANSCRIPTION_BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{backend}', "
+                         f"choose from {list(TRANSCRIPTION_BACKENDS)}")
+    return TRANSCRIPTION_BACKENDS[backend]()
+
+
+def to_audio_data(waveform, sample_rate):
+    """Wrap a float waveform in [-1, 1] as 16-bit PCM AudioData"""
+    pcm = (np.clip(np.asarray(waveform, dtype=np.float32), -1.0, 1.0) * 32767).astype('<i2')
+    return sr.AudioData(pcm.tobytes(), sample_rate=int(sample_rate), sample_width=2)
+
+
+class Transcriber:
+    """Transcribe clips or segments through a backend with caching and a worker pool
+
+    Results are cached per segment by audio content and backend, so repeated
+    segments (retries, re-runs) skip the engine. transcribe_many sends
+    segments to the backend concurrently through at most max_workers threads
+    and returns transcripts in input order. An unavailable engine
+    (speech_recognition.RequestError) gives "" unless raise_request_errors is
+    set, for callers that must retry rather than keep an empty transcript.
+    """
+
+    def __init__(self, backend='google', max_workers=4, cache=None, raise_request_errors=False):
+        self.backend = get_transcription_backend(backend)
+        self.max_workers = max_workers
+        self.cache = cache
+        self.raise_request_errors = raise_request_errors
+
+    def _cache_key(self, audio_data):
+        pcm = np.frombuffer(audio_data.get_raw_data(), dtype=np.uint8)
+        return FeatureCache.audio_hash(pcm, audio_data.sample_rate), {'backend': self.backend.name}
+
+    def transcribe(self, audio_data):
+        """Transcribe one AudioData; returns "" if nothing could be recognized"""
+        if self.cache is not None:
+            audio_hash, params = self._cache_key(audio_data)
+            cached = self.cache.get(audio_hash, params)
+            if cached is not None:
+                return cached['transcript']
+
+        try:
+            transcript = self.backend.transcribe(audio_data)
+        except sr.UnknownValueError:
+            print("Speech recognition could not understand audio")
+            transcript = ""
+        except sr.RequestError as e:
+            # Transient or missing engine: report but do not cache
+            if self.raise_request_errors:
+                raise
+            print(f"Could not request results from speech recognition service; {e}")
+            return ""
+
+        if self.cache is not None:
+            self.cache.put(audio_hash, params, {'transcript': transcript})
+        return transcript
+
+    def transcribe_timed(self, audio_data):
+        """Transcribe one AudioData and return (transcript, seconds taken)"""
+        start = time.perf_counter()
+        transcript = self.transcribe(audio_data)
+        return transcript, time.perf_counter() - start
+
+    def transcribe_many(self, segments, with_timing=False):
+        """Transcribe a list of AudioData concurrently, preserving order
+
+        With with_timing=True each result is a (transcript, seconds) pair.
+        """
+        worker = self.transcribe_timed if with_timing else self.transcribe
+        if self.max_workers <= 1 or len(segments) <= 1:
+            return [worker(segment) for segment in segments]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(segments))) as executor:
+            return list(executor.map(worker, segments))
+
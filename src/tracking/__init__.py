@@ -6,9 +6,11 @@ establishing personalized baselines, and detecting cognitive changes.
 """
 
 from .longitudinal_tracker import LongitudinalTracker
+from .connection import TrackingDatabase
+from .deviations import score_deviations
 
 __version__ = '1.0.0'
-__all__ = ['LongitudinalTracker']
+__all__ = ['LongitudinalTracker', 'TrackingDatabase', 'score_deviations']
 
 # Constants
 DEFAULT_BASELINE_MIN_SAMPLES = 3
@@ -0,0 +1,109 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class TrackingDatabase:
+    """
+    Managed SQLite connections for the tracking database
+
+    Each thread gets one persistent connection, opened on first use and
+    configured once (WAL journal, synchronous=NORMAL, busy timeout and a
+    prepared-statement cache), instead of connecting and re-parsing PRAGMAs
+    on every call. Writes go through transaction(), which takes the write
+    lock up front (BEGIN IMMEDIATE) so concurrent writers wait for each
+    other instead of failing with "database is locked" on lock upgrade.
+    """
+
+    def __init__(self, db_path, busy_timeout_ms=10000, cached_statements=256):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._rollback_callbacks = []
+
+    def connection(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path,
+                                   timeout=self.busy_timeout_ms / 1000,
+                                   cached_statements=self.cached_statements,
+                                   isolation_level=None,  # Transactions are explicit
+                                   check_same_thread=False)  # Only so close() can close it
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def on_rollback(self, callback):
+        """Call callback() whenever a transaction rolls back, before the write lock is released
+
+        Lets callers drop in-memory state derived from the rolled back writes.
+        """
+        self._rollback_callbacks.append(callback)
+
+    @contextmanager
+    def transaction(self):
+        """Run a block in a write transaction; commits on success, rolls back on error
+
+        Nested use joins the enclosing transaction.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            for callback in self._rollback_callbacks:
+                callback()
+            conn.rollback()
+            raise
+
+    def schema_version(self):
+        """Schema version recorded in the database (PRAGMA user_version)"""
+        return self.connection().execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self, migrations, target=None):
+        """Apply pending migrations in order and record the schema version
+
+        migrations[i] is a callable taking a cursor that upgrades the schema
+        from version i to i + 1. Each runs in its own write transaction, and
+        the version is re-read under the write lock, so concurrent processes
+        opening the same database apply every migration exactly once. target
+        stops at an earlier version (default: apply them all).
+        """
+        if target is not None:
+            migrations = migrations[:target]
+        for version, migration in enumerate(migrations, 1):
+            if self.schema_version() >= version:
+                continue
+            with self.transaction() as conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    continue  # Applied by another connection meanwhile
+                migration(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {version}")
+        return self.schema_version()
+
+    def close(self):
+        """Close the connections of all threads"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
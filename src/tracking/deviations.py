@@ -0,0 +1,78 @@
+import numpy as np
+
+# Deviation (in baseline standard deviations) a value must exceed for each alert severity
+SEVERITY_THRESHOLDS = {1: 1.5, 2: 2.0, 3: 3.0}  # 1: low, 2: medium, 3: high
+
+
+def score_deviations(values, baseline, upper, lower):
+    """
+    Deviation from baseline and alert severity of many feature values at once
+
+    Arguments broadcast against each other, so an (assessments x features)
+    matrix of values can be scored against per-feature baseline rows in one
+    call. The standard deviation is recovered from the thresholds, which sit
+    two standard deviations either side of the baseline. Missing (NaN) values
+    and baselines without spread get severity 0.
+
+    Returns:
+        (deviation, severity) arrays; severity is 0 for no alert, else 1-3
+    """
+    values = np.asarray(values, dtype=float)
+    deviation = values - np.asarray(baseline, dtype=float)
+    std_dev = (np.asarray(upper, dtype=float) - np.asarray(lower, dtype=float)) / 4
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = np.where(std_dev > 0, np.abs(deviation / std_dev), np.nan)
+
+    severity = np.zeros(z_score.shape, dtype=int)
+    for level, threshold in sorted(SEVERITY_THRESHOLDS.items()):
+        severity[z_score > threshold] = level
+    return deviation, severity
+
+
+def rolling_baselines(values, window, min_samples):
+    """
+    Baseline and thresholds in force at each value of time-ordered series
+
+    Replays the incremental baselines for every column of an (assessments x
+    features) matrix: a value's baseline is the median of the last `window`
+    values of its feature up to and including it, with thresholds two
+    standard deviations either side. Missing (NaN) values are skipped, and
+    values with fewer than min_samples values so far get NaN baselines.
+
+    Returns:
+        (baseline, upper, lower) arrays shaped like values
+    """
+    values = np.asarray(values, dtype=float)
+    columns = np.atleast_2d(values.T).T  # A series is a single column
+    baseline = np.full(columns.shape, np.nan)
+    std_dev = np.full(columns.shape, np.nan)
+
+    # Columns without gaps are replayed together, the others one at a time
+    gaps = np.isnan(columns).any(axis=0)
+    dense = np.flatnonzero(~gaps)
+    baseline[:, dense], std_dev[:, dense] = _window_stats(columns[:, dense], window, min_samples)
+    for col in np.flatnonzero(gaps):
+        present = ~np.isnan(columns[:, col])
+        col_baseline, col_std = _window_stats(columns[present, col][:, None], window, min_samples)
+        baseline[present, col], std_dev[present, col] = col_baseline[:, 0], col_std[:, 0]
+
+    shape = values.shape
+    return (baseline.reshape(shape), (baseline + 2 * std_dev).reshape(shape),
+            (baseline - 2 * std_dev).reshape(shape))
+
+
+def _window_stats(block, window, min_samples):
+    """Median and standard deviation of the trailing window at each row of a gap-free block"""
+    baseline = np.full(block.shape, np.nan)
+    std_dev = np.full(block.shape, np.nan)
+
+    # Full windows in one step, then the few shorter ones at the start
+    if len(block) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(block, window, axis=0)
+        baseline[window - 1:] = np.median(windows, axis=-1)
+        std_dev[window - 1:] = np.std(windows, axis=-1)
+    for end in range(min_samples, min(window, len(block) + 1)):
+        baseline[end - 1] = np.median(block[:end], axis=0)
+        std_dev[end - 1] = np.std(block[:end], axis=0)
+    return baseline, std_dev
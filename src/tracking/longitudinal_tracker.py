@@ -1,39 +1,103 @@
 import os
-import sqlite3
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 from pathlib import Path
+from itertools import islice
 import json
 import sys
 
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.tracking.connection import TrackingDatabase
+from src.tracking.deviations import rolling_baselines, score_deviations
+
+# Baselines use the median and spread of each feature's most recent values
+BASELINE_WINDOW = 5
+BASELINE_MIN_SAMPLES = 3
+
+# How assessment features are stored: one row per (assessment, feature), or
+# one float32 vector per assessment indexed through a feature dictionary
+FEATURE_STORAGE_LAYOUTS = ('rows', 'packed')
+
+# Per-assessment columns of get_user_history(wide=True), before the features
+HISTORY_COLUMNS = ['assessment_id', 'timestamp', 'task_type', 'risk_score']
 
 class LongitudinalTracker:
     """
     Tracks user speech patterns across multiple sessions to detect changes over time
     """
     
-    def __init__(self, db_path=None):
-        """Initialize the tracker with database connection"""
+    def __init__(self, db_path=None, feature_storage='rows', schema_version=None):
+        """Initialize the tracker with database connection
+        
+        Args:
+            db_path: SQLite database file
+            feature_storage: 'rows' or 'packed' (see FEATURE_STORAGE_LAYOUTS);
+                packed vectors hold values as float32
+            schema_version: Migrate the database only up to this version, e.g.
+                to benchmark an older schema (default: the latest). Methods
+                relying on later migrations fail on such a database.
+        """
+        if feature_storage not in FEATURE_STORAGE_LAYOUTS:
+            raise ValueError(f"Unknown feature storage '{feature_storage}'. "
+                             f"Available: {', '.join(FEATURE_STORAGE_LAYOUTS)}")
         if db_path is None:
             # Default database location
             db_path = Path("data/tracking/assessment_history.db")
             
         # Ensure directory exists
+        db_path = Path(db_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.db_path = db_path
-        self._init_database()
+        self.db = TrackingDatabase(db_path)
+        self.feature_storage = feature_storage
+        self._feature_index = {}  # Feature dictionary cache; committed indices never change
+        self.db.on_rollback(self._reset_feature_index)
+        self._init_database(schema_version)
     
-    def _init_database(self):
-        """Initialize the database schema if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def close(self):
+        """Close the tracker's database connections"""
+        self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def transaction(self):
+        """Context manager for a write transaction on this thread's connection"""
+        return self.db.transaction()
+    
+    def _init_database(self, schema_version=None):
+        """Create or upgrade the database schema to the current (or the given) version"""
+        version = self.db.migrate(self._migrations(), target=schema_version)
+        if version < len(self._migrations()):
+            return  # Predates packed storage
+        
+        # Features stored in the other layout would silently go missing
+        other_table = 'feature_vectors' if self.feature_storage == 'rows' else 'assessment_features'
+        if self.db.connection().execute(f"SELECT 1 FROM {other_table} LIMIT 1").fetchone():
+            self.close()
+            raise ValueError(f"{self.db_path} stores features in {other_table}; "
+                             f"open it with the matching feature_storage")
+    
+    def _migrations(self):
+        """Schema migrations in order; append new ones, never edit applied ones"""
+        return [
+            self._create_schema,   # 1: base tables
+            self._create_indexes,  # 2: indexes for the hot queries
+            self._create_baseline_windows,  # 3: rolling windows for incremental baselines
+            self._compact_baselines,  # 4: one baseline row per (user, feature)
+            self._create_feature_vectors,  # 5: packed feature storage
+        ]
+    
+    def _create_schema(self, cursor):
+        """Create the tables if they don't exist"""
         # Create users table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -100,15 +164,156 @@ class LongitudinalTracker:
             FOREIGN KEY (assessment_id) REFERENCES assessments(assessment_id)
         )
         ''')
+    
+    def _create_indexes(self, cursor):
+        """Index the columns every history, baseline and alert query filters on"""
+        # Assessments of a user in time order (history, baseline windows)
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_assessments_user_time
+        ON assessments(user_id, timestamp)
+        ''')
+        
+        # Features of an assessment; covering so joins never touch the table
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_features_assessment
+        ON assessment_features(assessment_id, feature_name, feature_value)
+        ''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_baselines_user_feature
+        ON user_baselines(user_id, feature_name)
+        ''')
+        
+        # Alerts per user and across users by recency and severity
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_alerts_user_time
+        ON alerts(user_id, timestamp)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_alerts_time_severity
+        ON alerts(timestamp, severity)
+        ''')
+    
+    def _create_baseline_windows(self, cursor):
+        """Add the rolling window table and fill it from existing assessments"""
+        # window_values is a JSON list of the most recent values, oldest first
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS baseline_windows (
+            user_id TEXT,
+            feature_name TEXT,
+            window_values TEXT,
+            PRIMARY KEY (user_id, feature_name)
+        ) WITHOUT ROWID
+        ''')
+        
+        windows = self._load_recent_row_values(cursor)  # The only layout at version 3
+        cursor.executemany('''
+        INSERT OR REPLACE INTO baseline_windows (user_id, feature_name, window_values)
+        VALUES (?, ?, ?)
+        ''', [(user_id, name, json.dumps(values)) for (user_id, name), values in windows.items()])
+    
+    def _compact_baselines(self, cursor):
+        """Key user_baselines by (user_id, feature_name), keeping the latest row of each
+        
+        Earlier versions appended a row per assessment because the table had no
+        unique key for INSERT OR REPLACE to act on.
+        """
+        cursor.execute("PRAGMA table_info(user_baselines)")
+        if 'baseline_id' not in [row[1] for row in cursor.fetchall()]:
+            return  # Already compacted
+        
+        cursor.execute('''
+        CREATE TABLE user_baselines_compact (
+            user_id TEXT,
+            feature_name TEXT,
+            baseline_value REAL,
+            upper_threshold REAL,
+            lower_threshold REAL,
+            last_updated TIMESTAMP,
+            PRIMARY KEY (user_id, feature_name),
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+        INSERT INTO user_baselines_compact
+        SELECT user_id, feature_name, baseline_value, upper_threshold, lower_threshold, last_updated
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id, feature_name
+                                         ORDER BY baseline_id DESC) AS recency
+            FROM user_baselines
+        )
+        WHERE recency = 1
+        ''')
+        # Dropping the table also drops idx_baselines_user_feature; the key replaces it
+        cursor.execute("DROP TABLE user_baselines")
+        cursor.execute("ALTER TABLE user_baselines_compact RENAME TO user_baselines")
+    
+    def _create_feature_vectors(self, cursor):
+        """Add the tables of the packed feature layout"""
+        # Position of each feature in the packed vectors; only ever appended to
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feature_dictionary (
+            feature_index INTEGER PRIMARY KEY,
+            feature_name TEXT UNIQUE NOT NULL
+        )
+        ''')
         
-        conn.commit()
-        conn.close()
+        # One little-endian float32 vector per assessment, NaN where a feature is missing
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feature_vectors (
+            assessment_id TEXT PRIMARY KEY,
+            feature_vector BLOB,
+            FOREIGN KEY (assessment_id) REFERENCES assessments(assessment_id)
+        ) WITHOUT ROWID
+        ''')
+    
+    def _feature_indices(self, cursor, feature_names):
+        """Dictionary positions of feature_names, adding unknown features"""
+        if any(name not in self._feature_index for name in feature_names):
+            # Another tracker may have added features; reload before adding our own
+            cursor.execute("SELECT feature_name, feature_index FROM feature_dictionary")
+            index = dict(cursor.fetchall())
+            missing = [name for name in dict.fromkeys(feature_names) if name not in index]
+            # Safe to number ourselves: callers hold the write transaction
+            added = {name: len(index) + i for i, name in enumerate(missing)}
+            cursor.executemany("INSERT INTO feature_dictionary (feature_index, feature_name) VALUES (?, ?)",
+                               [(position, name) for name, position in added.items()])
+            index.update(added)
+            self._feature_index = index
+        return [self._feature_index[name] for name in feature_names]
+    
+    def _reset_feature_index(self):
+        """Forget cached dictionary positions; those added by a rolled back write are void"""
+        self._feature_index = {}
+    
+    def _feature_names(self, cursor, size):
+        """Names of the first size dictionary positions (None for unused positions)"""
+        if len(self._feature_index) < size:
+            cursor.execute("SELECT feature_name, feature_index FROM feature_dictionary")
+            self._feature_index = dict(cursor.fetchall())
+        names = [None] * size
+        for name, position in self._feature_index.items():
+            if position < size:
+                names[position] = name
+        return names
+    
+    def _unpack_vectors(self, cursor, blobs):
+        """Stack packed vectors into a (len(blobs), n_features) matrix and name its columns"""
+        vectors = [np.frombuffer(blob, dtype='<f4') for blob in blobs]
+        width = max((len(vector) for vector in vectors), default=0)
+        matrix = np.full((len(vectors), width), np.nan, dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            matrix[row, :len(vector)] = vector  # Older vectors predate later features
+        return matrix, self._feature_names(cursor, width)
     
     def register_user(self, user_id, name=None, age=None, gender=None, notes=None):
         """Register a new user or update existing user details"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self.db.transaction() as conn:
+            self._register_user(conn.cursor(), user_id, name, age, gender, notes)
+        return user_id
+    
+    def _register_user(self, cursor, user_id, name, age, gender, notes):
+        """Insert a user or update the given details of an existing one"""
         # Check if user exists
         cursor.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,))
         user_exists = cursor.fetchone() is not None
@@ -129,10 +334,6 @@ class LongitudinalTracker:
             INSERT INTO users (user_id, name, age, gender, notes)
             VALUES (?, ?, ?, ?, ?)
             ''', (user_id, name, age, gender, notes))
-        
-        conn.commit()
-        conn.close()
-        return user_id
     
     def store_assessment(self, user_id, features, risk_score, task_type=0, 
                         audio_path=None, transcript=None, assessment_id=None):
@@ -140,9 +341,111 @@ class LongitudinalTracker:
         if assessment_id is None:
             assessment_id = f"{user_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.db.transaction() as conn:
+            self._store_assessment(conn.cursor(), assessment_id, user_id, features, risk_score,
+                                   task_type, audio_path, transcript)
         
+        return assessment_id
+    
+    def store_assessments_bulk(self, assessments, chunk_size=5000, check_deviations=True):
+        """Store many assessments at once, e.g. history imported from another system
+        
+        Args:
+            assessments: Iterable of dicts with the store_assessment arguments
+                (user_id, features, risk_score and optionally task_type,
+                audio_path, transcript, assessment_id) plus an optional
+                timestamp (datetime or ISO string, default now). Consumed
+                lazily, chunk_size assessments at a time.
+            chunk_size: Assessments inserted per transaction
+            check_deviations: Check each affected user's latest imported
+                assessment against the rebuilt baselines
+        
+        Rows are inserted with executemany, one transaction per chunk;
+        baselines are rebuilt once per affected user after the last chunk
+        instead of after every assessment. Unregistered users are created.
+        Records without an assessment_id get one from their user, timestamp
+        (to the microsecond) and position among records sharing both.
+        Assessments whose id is already stored are skipped and reported, so
+        an interrupted import can be run again; the baselines of users in
+        chunks committed before a failure are rebuilt all the same.
+        
+        Returns:
+            Number of assessments stored
+        """
+        assessments = iter(assessments)
+        latest = {}  # user_id -> (timestamp, assessment_id, features) of the newest assessment
+        generated = {}  # Generated id -> records given it so far
+        count = skipped = 0
+        
+        try:
+            while True:
+                chunk = list(islice(assessments, chunk_size))
+                if not chunk:
+                    break
+                
+                rows = {}  # assessment_id -> (timestamp, record); later duplicates are skipped
+                for record in chunk:
+                    timestamp = record.get('timestamp') or datetime.now()
+                    if isinstance(timestamp, str):
+                        timestamp = datetime.fromisoformat(timestamp)
+                    assessment_id = record.get('assessment_id')
+                    if not assessment_id:
+                        assessment_id = f"{record['user_id']}_{timestamp.strftime('%Y%m%d%H%M%S%f')}"
+                        repeat = generated.get(assessment_id, 0)
+                        generated[assessment_id] = repeat + 1
+                        if repeat:
+                            assessment_id = f"{assessment_id}_{repeat}"
+                    rows.setdefault(assessment_id, (timestamp, record))
+                
+                with self.db.transaction() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('''
+                    SELECT assessment_id FROM assessments
+                    WHERE assessment_id IN (SELECT value FROM json_each(?))
+                    ''', (json.dumps(list(rows)),))
+                    for (assessment_id,) in cursor.fetchall():
+                        del rows[assessment_id]
+                    
+                    user_ids = dict.fromkeys(record['user_id'] for _, record in rows.values())
+                    cursor.executemany("INSERT OR IGNORE INTO users (user_id) VALUES (?)",
+                                       [(user_id,) for user_id in user_ids])
+                    cursor.executemany('''
+                    INSERT INTO assessments
+                        (assessment_id, user_id, task_type, timestamp, audio_path, transcript, risk_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (assessment_id) DO NOTHING
+                    ''', [(assessment_id, record['user_id'], record.get('task_type', 0),
+                           timestamp.isoformat(), record.get('audio_path'), record.get('transcript'),
+                           record['risk_score']) for assessment_id, (timestamp, record) in rows.items()])
+                    self._store_features(cursor, [(assessment_id, record['features'])
+                                                  for assessment_id, (_, record) in rows.items()])
+                
+                # Only committed assessments take part in the baseline pass
+                for assessment_id, (timestamp, record) in rows.items():
+                    user_id = record['user_id']
+                    if user_id not in latest or timestamp >= latest[user_id][0]:
+                        latest[user_id] = (timestamp, assessment_id, record['features'])
+                count += len(rows)
+                skipped += len(chunk) - len(rows)
+        finally:
+            # One baseline (and deviation) pass per affected user
+            user_ids = list(latest)
+            for start in range(0, len(user_ids), chunk_size):
+                with self.db.transaction() as conn:
+                    cursor = conn.cursor()
+                    for user_id in user_ids[start:start + chunk_size]:
+                        self._update_user_baseline(cursor, user_id)
+                        if check_deviations:
+                            _, assessment_id, features = latest[user_id]
+                            self._check_for_deviations(cursor, user_id, assessment_id, features)
+        
+        if skipped:
+            print(f"Skipped {skipped} assessments that were already stored")
+        return count
+    
+    def _store_assessment(self, cursor, assessment_id, user_id, features, risk_score,
+                          task_type, audio_path, transcript):
+        """Insert an assessment, then refresh baselines and check deviations"""
         # Store assessment
         cursor.execute('''
         INSERT INTO assessments
@@ -152,157 +455,315 @@ class LongitudinalTracker:
               audio_path, transcript, risk_score))
         
         # Store all features
-        feature_values = []
-        for feature_name, feature_value in features.items():
-            if isinstance(feature_value, (int, float)):  # Store only numeric features
-                feature_values.append((assessment_id, feature_name, feature_value))
-        
-        cursor.executemany('''
-        INSERT INTO assessment_features
-            (assessment_id, feature_name, feature_value)
-        VALUES (?, ?, ?)
-        ''', feature_values)
-        
-        conn.commit()
+        self._store_features(cursor, [(assessment_id, features)])
         
         # Calculate baseline if enough data is available
-        self._update_user_baseline(cursor, user_id)
+        self._update_user_baseline(cursor, user_id, features)
         
         # Check for significant deviations
         self._check_for_deviations(cursor, user_id, assessment_id, features)
-        
-        conn.commit()
-        conn.close()
-        
-        return assessment_id
     
-    def _update_user_baseline(self, cursor, user_id):
-        """Update user baseline if enough assessments are available"""
-        # Get count of assessments for this user
-        cursor.execute('''
-        SELECT COUNT(*) FROM assessments WHERE user_id = ?
-        ''', (user_id,))
-        
-        assessment_count = cursor.fetchone()[0]
-        
-        # Only calculate baseline if we have at least 3 assessments
-        if assessment_count < 3:
+    def _store_features(self, cursor, assessments):
+        """Store the numeric features of (assessment_id, features) pairs in the configured layout"""
+        # Store only numeric features
+        assessments = [(assessment_id, {name: value for name, value in features.items()
+                                        if isinstance(value, (int, float))})
+                       for assessment_id, features in assessments]
+        
+        if self.feature_storage == 'rows':
+            cursor.executemany('''
+            INSERT INTO assessment_features
+                (assessment_id, feature_name, feature_value)
+            VALUES (?, ?, ?)
+            ''', [(assessment_id, name, value) for assessment_id, numeric in assessments
+                  for name, value in numeric.items()])
             return
         
-        # Get all features with at least 3 measurements
-        cursor.execute('''
-        SELECT feature_name, COUNT(*) as count
-        FROM assessment_features af
-        JOIN assessments a ON af.assessment_id = a.assessment_id
-        WHERE a.user_id = ?
-        GROUP BY feature_name
-        HAVING count >= 3
-        ''', (user_id,))
-        
-        features_to_update = cursor.fetchall()
-        
-        for feature_name, _ in features_to_update:
-            # Get feature values for this user
+        names = list(dict.fromkeys(name for _, numeric in assessments for name in numeric))
+        index = dict(zip(names, self._feature_indices(cursor, names)))
+        vectors = []
+        for assessment_id, numeric in assessments:
+            if numeric:
+                positions = [index[name] for name in numeric]
+                vector = np.full(max(positions) + 1, np.nan, dtype='<f4')
+                vector[positions] = list(numeric.values())
+                vectors.append((assessment_id, vector.tobytes()))
+        cursor.executemany("INSERT INTO feature_vectors (assessment_id, feature_vector) VALUES (?, ?)",
+                           vectors)
+    
+    def _update_user_baseline(self, cursor, user_id, features=None):
+        """Update user baselines from a rolling window of recent values per feature
+        
+        With the features of a newly stored assessment, each feature's window
+        gains one value (O(1) work per feature). Without features the user's
+        windows are rebuilt from the stored assessments. Windows and baselines
+        are then written with one batched statement each.
+        """
+        if features is None:
+            windows = {name: values for (_, name), values
+                       in self._load_recent_values(cursor, user_id).items()}
+        else:
+            new_values = {name: float(value) for name, value in features.items()
+                          if isinstance(value, (int, float))}
+            if not new_values:
+                return
+            if self.feature_storage == 'packed':
+                # Match the float32 values a rebuild reads back
+                new_values = {name: float(np.float32(value)) for name, value in new_values.items()}
+            
             cursor.execute('''
-            SELECT feature_value
+            SELECT feature_name, window_values FROM baseline_windows WHERE user_id = ?
+            ''', (user_id,))
+            stored = {row[0]: json.loads(row[1]) for row in cursor.fetchall()}
+            
+            windows = {}
+            for feature_name, value in new_values.items():
+                window = stored.get(feature_name, [])
+                window.append(value)
+                windows[feature_name] = window[-BASELINE_WINDOW:]
+        
+        self._write_baselines(cursor, {(user_id, name): values for name, values in windows.items()})
+    
+    def _load_recent_values(self, cursor, user_id=None):
+        """Last BASELINE_WINDOW values of every (user, feature), oldest first"""
+        if self.feature_storage == 'packed':
+            return self._load_recent_vector_values(cursor, user_id)
+        return self._load_recent_row_values(cursor, user_id)
+    
+    def _load_recent_row_values(self, cursor, user_id=None):
+        """_load_recent_values for the rows layout"""
+        user_filter = "WHERE a.user_id = ?" if user_id is not None else ""
+        cursor.execute(f'''
+        SELECT user_id, feature_name, feature_value FROM (
+            SELECT a.user_id, af.feature_name, af.feature_value, a.timestamp,
+                   ROW_NUMBER() OVER (PARTITION BY a.user_id, af.feature_name
+                                      ORDER BY a.timestamp DESC) AS recency
             FROM assessment_features af
             JOIN assessments a ON af.assessment_id = a.assessment_id
-            WHERE a.user_id = ? AND feature_name = ?
-            ORDER BY a.timestamp DESC
-            LIMIT 5
-            ''', (user_id, feature_name))
-            
-            values = [row[0] for row in cursor.fetchall()]
-            
-            if len(values) >= 3:
-                # Calculate baseline (median) and thresholds
-                baseline_value = np.median(values)
-                std_dev = np.std(values)
+            {user_filter}
+        )
+        WHERE recency <= ?
+        ORDER BY user_id, feature_name, timestamp
+        ''', ([user_id] if user_id is not None else []) + [BASELINE_WINDOW])
+        
+        windows = {}
+        for row_user_id, feature_name, feature_value in cursor.fetchall():
+            windows.setdefault((row_user_id, feature_name), []).append(feature_value)
+        return windows
+    
+    def _load_recent_vector_values(self, cursor, user_id=None):
+        """_load_recent_values for the packed layout"""
+        user_filter = "WHERE a.user_id = ?" if user_id is not None else ""
+        cursor.execute(f'''
+        SELECT a.user_id, fv.feature_vector
+        FROM assessments a
+        JOIN feature_vectors fv ON fv.assessment_id = a.assessment_id
+        {user_filter}
+        ORDER BY a.user_id, a.timestamp
+        ''', [user_id] if user_id is not None else [])
+        rows = cursor.fetchall()
+        if not rows:
+            return {}
+        matrix, names = self._unpack_vectors(cursor, [blob for _, blob in rows])
+        
+        # Rows arrive grouped by user; split the matrix at the user boundaries
+        bounds = [i for i in range(1, len(rows)) if rows[i][0] != rows[i - 1][0]]
+        windows = {}
+        for start, end in zip([0] + bounds, bounds + [len(rows)]):
+            row_user_id, user_matrix = rows[start][0], matrix[start:end]
+            for position in np.flatnonzero(~np.isnan(user_matrix).all(axis=0)):
+                values = user_matrix[:, position]
+                values = values[~np.isnan(values)][-BASELINE_WINDOW:]
+                windows[(row_user_id, names[position])] = values.tolist()
+        return windows
+    
+    def _write_baselines(self, cursor, windows):
+        """Store rolling windows and the baselines of those with enough values"""
+        cursor.executemany('''
+        INSERT INTO baseline_windows (user_id, feature_name, window_values)
+        VALUES (?, ?, ?)
+        ON CONFLICT (user_id, feature_name) DO UPDATE SET window_values = excluded.window_values
+        ''', [(user_id, name, json.dumps(values)) for (user_id, name), values in windows.items()])
+        
+        now = datetime.now().isoformat()
+        baselines = []
+        for (user_id, feature_name), values in windows.items():
+            if len(values) >= BASELINE_MIN_SAMPLES:
+                # Calculate baseline (median) and thresholds; windows are tiny,
+                # so plain Python beats numpy's per-call overhead here
+                ordered = sorted(values)
+                middle = len(ordered) // 2
+                baseline_value = (ordered[middle] if len(ordered) % 2
+                                  else (ordered[middle - 1] + ordered[middle]) / 2)
+                mean = sum(ordered) / len(ordered)
+                std_dev = (sum((v - mean) ** 2 for v in ordered) / len(ordered)) ** 0.5
                 
                 # Set thresholds based on 2 standard deviations
-                upper_threshold = baseline_value + (2 * std_dev)
-                lower_threshold = baseline_value - (2 * std_dev)
-                
-                # Update or insert baseline
-                cursor.execute('''
-                INSERT OR REPLACE INTO user_baselines
-                    (user_id, feature_name, baseline_value, upper_threshold, 
-                     lower_threshold, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ''', (user_id, feature_name, baseline_value, upper_threshold, 
-                      lower_threshold, datetime.now().isoformat()))
+                baselines.append((user_id, feature_name, baseline_value,
+                                  baseline_value + (2 * std_dev), baseline_value - (2 * std_dev), now))
+        
+        # Update or insert baselines
+        cursor.executemany('''
+        INSERT INTO user_baselines
+            (user_id, feature_name, baseline_value, upper_threshold,
+             lower_threshold, last_updated)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, feature_name) DO UPDATE SET
+            baseline_value = excluded.baseline_value,
+            upper_threshold = excluded.upper_threshold,
+            lower_threshold = excluded.lower_threshold,
+            last_updated = excluded.last_updated
+        ''', baselines)
     
     def _check_for_deviations(self, cursor, user_id, assessment_id, features):
         """Check for significant deviations from baseline"""
-        # Only check if we have baselines
-        cursor.execute('''
-        SELECT COUNT(*) FROM user_baselines WHERE user_id = ?
-        ''', (user_id,))
+        baselines = self._load_baseline_arrays(cursor, user_id)
+        if baselines is None:
+            return
+        index, thresholds = baselines
         
-        if cursor.fetchone()[0] == 0:
+        numeric = [(name, value) for name, value in features.items()
+                   if name in index and isinstance(value, (int, float))]
+        if not numeric:
             return
         
-        # Get all baselines for this user
+        # Score every feature against its baseline in one step
+        rows = thresholds[[index[name] for name, _ in numeric]]
+        deviation, severity = score_deviations([value for _, value in numeric], *rows.T)
+        
+        # Store alerts
+        alerts = [(user_id, assessment_id, name, float(deviation[i]), int(severity[i]))
+                  for i, (name, _) in enumerate(numeric) if severity[i] > 0]
+        if alerts:
+            cursor.executemany('''
+            INSERT INTO alerts
+                (user_id, assessment_id, feature_name, deviation_value, severity)
+            VALUES (?, ?, ?, ?, ?)
+            ''', alerts)
+    
+    def _load_baseline_arrays(self, cursor, user_id):
+        """A user's baselines as ({feature_name: row}, [baseline, upper, lower] rows), or None"""
         cursor.execute('''
         SELECT feature_name, baseline_value, upper_threshold, lower_threshold
         FROM user_baselines
         WHERE user_id = ?
         ''', (user_id,))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+        index = {row[0]: i for i, row in enumerate(rows)}
+        return index, np.array([row[1:] for row in rows], dtype=float)
+    
+    def backfill_alerts(self, user_ids=None, days=None):
+        """Score stored assessments against the baselines in force at the time and add their alerts
+        
+        Each assessment is checked against the baseline store_assessment
+        would have used: its features' last BASELINE_WINDOW values up to and
+        including it, with no alert before BASELINE_MIN_SAMPLES values. Each
+        user's history is read once as an (assessments x features) matrix
+        and replayed per feature with sliding windows; all new alerts are
+        then written in one transaction. Alerts already recorded for an
+        (assessment, feature) pair are left as they are, so re-running is
+        safe. Backfilled alerts carry their assessment's timestamp.
+        
+        Args:
+            user_ids: Users to re-score (default: every user with assessments)
+            days: Only add alerts for assessments from the last days
+                (default: all history); older ones still shape the baselines
+        
+        Returns:
+            Number of alerts added
+        """
+        cursor = self.db.connection().cursor()
+        if user_ids is None:
+            cursor.execute("SELECT DISTINCT user_id FROM assessments")
+            user_ids = [row[0] for row in cursor.fetchall()]
+        cutoff = pd.Timestamp(datetime.now() - timedelta(days=days)) if days else None
         
-        baselines = {row[0]: {"baseline": row[1], "upper": row[2], "lower": row[3]} 
-                   for row in cursor.fetchall()}
-        
-        # Check each feature for deviations
         alerts = []
-        for feature_name, feature_value in features.items():
-            if feature_name in baselines and isinstance(feature_value, (int, float)):
-                baseline = baselines[feature_name]
-                
-                # Calculate z-score
-                std_range = (baseline["upper"] - baseline["lower"]) / 4  # Approx 2 std devs
-                if std_range > 0:
-                    z_score = abs((feature_value - baseline["baseline"]) / std_range)
-                    
-                    # Determine severity
-                    severity = 0
-                    if z_score > 3:  # Very significant deviation (>3 std devs)
-                        severity = 3
-                    elif z_score > 2:  # Significant deviation (>2 std devs)
-                        severity = 2
-                    elif z_score > 1.5:  # Minor deviation (>1.5 std devs)
-                        severity = 1
-                    
-                    if severity > 0:
-                        deviation = feature_value - baseline["baseline"]
-                        alerts.append((user_id, assessment_id, feature_name, 
-                                      deviation, severity))
-        
-        # Store alerts
-        if alerts:
-            cursor.executemany('''
+        for user_id in user_ids:
+            # Features apart from the assessment columns, so a tracked risk_score is kept
+            history, features = self._read_history(user_id, None, days=None, wide=True)
+            names = list(features.columns)
+            if not names:
+                continue
+            
+            # Replay every feature's baselines, then score all values at once
+            values = features.to_numpy(dtype=float)
+            baseline, upper, lower = rolling_baselines(values, BASELINE_WINDOW, BASELINE_MIN_SAMPLES)
+            deviation, severity = score_deviations(values, baseline, upper, lower)
+            if cutoff is not None:
+                severity[(history['timestamp'] < cutoff).to_numpy()] = 0
+            
+            cursor.execute("SELECT assessment_id, feature_name FROM alerts WHERE user_id = ?", (user_id,))
+            existing = set(cursor.fetchall())
+            assessment_ids = history['assessment_id'].to_numpy()
+            timestamps = [timestamp.isoformat() for timestamp in history['timestamp']]
+            for row, col in zip(*np.nonzero(severity)):
+                if (assessment_ids[row], names[col]) not in existing:
+                    alerts.append((user_id, assessment_ids[row], names[col], float(deviation[row, col]),
+                                   int(severity[row, col]), timestamps[row]))
+        
+        with self.db.transaction() as conn:
+            conn.executemany('''
             INSERT INTO alerts
-                (user_id, assessment_id, feature_name, deviation_value, severity)
-            VALUES (?, ?, ?, ?, ?)
+                (user_id, assessment_id, feature_name, deviation_value, severity, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
             ''', alerts)
+        return len(alerts)
     
-    def get_user_history(self, user_id, feature_names=None, days=90):
-        """Get historical assessment data for a user"""
-        conn = sqlite3.connect(self.db_path)
+    def get_user_history(self, user_id, feature_names=None, days=90, wide=False):
+        """Get historical assessment data for a user
+        
+        Returns one row per (assessment, feature) with feature_name and
+        feature_value columns, or with wide=True one row per assessment
+        (HISTORY_COLUMNS) plus a column per feature, NaN where missing.
+        """
+        if not wide:
+            return self._read_history(user_id, feature_names, days, wide=False)
+        assessments, features = self._read_history(user_id, feature_names, days, wide=True)
+        
+        # Features named like an assessment column would clash with it
+        features = features.drop(columns=[name for name in features.columns if name in HISTORY_COLUMNS])
+        has_values = features.notna().any(axis=1).to_numpy()
+        return pd.concat([assessments, features], axis=1)[has_values].reset_index(drop=True)
+    
+    def _read_history(self, user_id, feature_names, days, wide):
+        """get_user_history, with wide=True as separate (assessments, features) frames
         
-        # Calculate date range
+        The features frame keeps every feature, including those named like
+        an assessment column (e.g. a tracked risk_score).
+        """
+        # Calculate date range; days=None covers the whole history
         end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        start_date = end_date - timedelta(days=days) if days else datetime.min
+        params = [user_id, start_date.isoformat(), end_date.isoformat()]
+        
+        if self.feature_storage == 'packed':
+            result = self._read_vector_history(params, feature_names, wide)
+        else:
+            result = self._read_row_history(params, feature_names, wide)
+        
+        # Convert timestamp to datetime
+        df = result[0] if wide else result
+        if not df.empty:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            
+        return result
+    
+    def _read_row_history(self, params, feature_names, wide):
+        """get_user_history for the rows layout"""
+        conn = self.db.connection()
         
         # Build query for selected features or all features
         if feature_names:
             feature_filter = f"AND af.feature_name IN ({','.join(['?']*len(feature_names))})"
-            params = [user_id, start_date.isoformat(), end_date.isoformat()] + feature_names
+            params = params + list(feature_names)
         else:
             feature_filter = ""
-            params = [user_id, start_date.isoformat(), end_date.isoformat()]
             
         query = f'''
-        SELECT a.timestamp, a.task_type, a.risk_score, af.feature_name, af.feature_value
+        SELECT a.assessment_id, a.timestamp, a.task_type, a.risk_score, af.feature_name, af.feature_value
         FROM assessments a
         JOIN assessment_features af ON a.assessment_id = af.assessment_id
         WHERE a.user_id = ? AND a.timestamp BETWEEN ? AND ? {feature_filter}
@@ -311,17 +772,54 @@ class LongitudinalTracker:
         
         # Execute query
         df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
-        
-        # Convert timestamp to datetime
-        if not df.empty:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
+        if not wide:
+            return df.drop(columns='assessment_id')
+        
+        df = df.pivot(index=HISTORY_COLUMNS, columns='feature_name', values='feature_value')
+        df.columns.name = None
+        assessments = df.index.to_frame(index=False)
+        order = assessments.sort_values('timestamp', kind='stable').index
+        return (assessments.loc[order].reset_index(drop=True),
+                df.reset_index(drop=True).loc[order].reset_index(drop=True))
+    
+    def _read_vector_history(self, params, feature_names, wide):
+        """get_user_history for the packed layout: one indexed range read, one vector per assessment"""
+        cursor = self.db.connection().cursor()
+        cursor.execute('''
+        SELECT a.assessment_id, a.timestamp, a.task_type, a.risk_score, fv.feature_vector
+        FROM assessments a
+        JOIN feature_vectors fv ON a.assessment_id = fv.assessment_id
+        WHERE a.user_id = ? AND a.timestamp BETWEEN ? AND ?
+        ORDER BY a.timestamp
+        ''', params)
+        rows = cursor.fetchall()
+        
+        assessments = pd.DataFrame([row[:4] for row in rows], columns=HISTORY_COLUMNS)
+        matrix, names = self._unpack_vectors(cursor, [row[4] for row in rows])
+        
+        # Select the requested features, in name order like the rows layout
+        keep = sorted((name, position) for position, name in enumerate(names)
+                      if name is not None and (not feature_names or name in feature_names))
+        names = [name for name, _ in keep]
+        matrix = matrix[:, [position for _, position in keep]].astype(float)
+        present = ~np.isnan(matrix)
+        
+        if wide:
+            has_values = present.any(axis=1)
+            features_df = pd.DataFrame(matrix, columns=names).loc[:, present.any(axis=0)]
+            return (assessments[has_values].reset_index(drop=True),
+                    features_df[has_values].reset_index(drop=True))
+        
+        # Long format: one row per stored value, in assessment order
+        rows_idx, cols_idx = np.nonzero(present)
+        df = assessments.iloc[rows_idx].drop(columns='assessment_id').reset_index(drop=True)
+        df['feature_name'] = np.array(names, dtype=object)[cols_idx]
+        df['feature_value'] = matrix[rows_idx, cols_idx]
         return df
     
     def get_user_baselines(self, user_id):
         """Get current baseline values for a user"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         
         query = '''
         SELECT feature_name, baseline_value, upper_threshold, lower_threshold, last_updated
@@ -330,13 +828,12 @@ class LongitudinalTracker:
         '''
         
         df = pd.read_sql_query(query, conn, params=[user_id])
-        conn.close()
         
         return df
     
     def get_alerts(self, user_id=None, days=30, severity=None, unreviewed_only=False):
         """Get alerts for a user or all users"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         
         # Build query conditions
         conditions = []
@@ -370,19 +867,13 @@ class LongitudinalTracker:
         '''
         
         df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
         
         return df
         
     def mark_alert_reviewed(self, alert_id):
         """Mark an alert as reviewed"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("UPDATE alerts SET is_reviewed = 1 WHERE alert_id = ?", (alert_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE alerts SET is_reviewed = 1 WHERE alert_id = ?", (alert_id,))
         
     def generate_trend_report(self, user_id, output_path=None, days=90):
         """Generate a visual report showing trends over time"""
@@ -390,8 +881,8 @@ class LongitudinalTracker:
             output_path = Path("reports/trends")
             output_path.mkdir(exist_ok=True, parents=True)
             
-        # Get historical data
-        history_df = self.get_user_history(user_id, days=days)
+        # Get historical data, one row per assessment
+        history_df = self.get_user_history(user_id, days=days, wide=True)
         baselines_df = self.get_user_baselines(user_id)
         alerts_df = self.get_alerts(user_id, days=days)
         
@@ -399,11 +890,8 @@ class LongitudinalTracker:
             return None
             
         # Get user information
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name, age, gender FROM users WHERE user_id = ?", (user_id,))
-        user_info = cursor.fetchone()
-        conn.close()
+        user_info = self.db.connection().execute(
+            "SELECT name, age, gender FROM users WHERE user_id = ?", (user_id,)).fetchone()
         
         user_name = user_info[0] if user_info and user_info[0] else user_id
             
@@ -413,15 +901,18 @@ class LongitudinalTracker:
         
         timestamps = history_df['timestamp'].unique()
         
-        # Prepare for visualization
+        # Prepare for visualization (risk_score is a column but not a feature)
+        feature_columns = history_df.columns[len(HISTORY_COLUMNS):]
         trends = {}
         for feature in key_features:
-            feature_data = history_df[history_df['feature_name'] == feature]
-            if not feature_data.empty:
-                trends[feature] = feature_data[['timestamp', 'feature_value']].set_index('timestamp')
+            if feature in feature_columns:
+                feature_data = history_df[['timestamp', feature]].dropna()
+                if not feature_data.empty:
+                    trends[feature] = feature_data.set_index('timestamp').rename(
+                        columns={feature: 'feature_value'})
         
         # Also include risk score
-        risk_scores = history_df[['timestamp', 'risk_score']].drop_duplicates().set_index('timestamp')
+        risk_scores = history_df[['timestamp', 'risk_score']].set_index('timestamp')
         
         # Create trend plots
         plt.figure(figsize=(12, 15))
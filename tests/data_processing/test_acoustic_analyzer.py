@@ -0,0 +1,191 @@
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+librosa = pytest.importorskip("librosa")
+sf = pytest.importorskip("soundfile")
+
+from src.data_processing.acoustic_analyzer import AcousticAnalyzer, resolve_feature_groups
+from src.data_processing.spectral_frontend import SpectralFrontend, pitch_statistics
+from src.data_processing.feature_cache import FeatureCache
+from src.data_processing.streaming import RunningStats, read_mono_blocks
+from src.data_processing.audio_ingest import AudioIngest
+
+SR = 16000
+
+def _voiced_tone(duration=2.0, f0=150.0, sr=SR):
+    """Harmonic tone with a syllable-like on/off envelope"""
+    t = np.arange(int(sr * duration)) / sr
+    y = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 5))
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0).astype(float) * 0.5
+    return (y * envelope).astype(np.float32)
+
+@pytest.fixture
+def tone_path(tmp_path):
+    path = tmp_path / "tone.wav"
+    sf.write(path, _voiced_tone(), SR)
+    return path
+
+def test_frontend_matches_direct_librosa():
+    y = _voiced_tone()
+    frontend = SpectralFrontend(y, SR)
+
+    np.testing.assert_allclose(
+        frontend.mfcc, librosa.feature.mfcc(y=y, sr=SR, n_mfcc=13), rtol=1e-4, atol=1e-3)
+    np.testing.assert_allclose(
+        frontend.onset_envelope, librosa.onset.onset_strength(y=y, sr=SR), rtol=1e-4, atol=1e-4)
+
+def test_pitch_track_matches_per_frame_selection():
+    frontend = SpectralFrontend(_voiced_tone(), SR)
+    pitches, magnitudes = librosa.piptrack(S=frontend.magnitude, sr=SR)
+    expected = [pitches[magnitudes[:, i].argmax(), i] for i in range(magnitudes.shape[1])]
+
+    np.testing.assert_array_equal(frontend.pitch_track, expected)
+    assert pitch_statistics(frontend.pitch_track)['pitch_mean'] > 0
+
+def test_pitch_statistics_without_voiced_frames():
+    assert pitch_statistics(np.zeros(10)) == {
+        'pitch_mean': 0, 'pitch_std': 0, 'pitch_range': 0, 'pitch_variability': 0}
+
+def test_extract_features(tone_path):
+    features = AcousticAnalyzer().extract_features(tone_path)
+
+    assert features['duration'] == pytest.approx(2.0, abs=0.01)
+    assert features['pitch_mean'] > 0
+    assert 'mfcc13_std' in features
+    assert 0 <= features['harmonic_ratio'] <= 1
+
+def test_extract_features_batch_isolates_failures(tone_path, tmp_path):
+    paths = [tone_path, tmp_path / "missing.wav", tone_path]
+    results = AcousticAnalyzer().extract_features_batch(paths, workers=2)
+
+    assert list(results['audio_path']) == [str(p) for p in paths]
+    assert results['error'].isna().tolist() == [True, False, True]
+    assert results.loc[0, 'pitch_mean'] == pytest.approx(results.loc[2, 'pitch_mean'])
+
+def test_feature_cache_hits_skip_extraction(tone_path, tmp_path):
+    cache = FeatureCache(tmp_path / "cache")
+    analyzer = AcousticAnalyzer(cache=cache)
+
+    first = analyzer.extract_features(tone_path)
+    second = analyzer.extract_features(tone_path)
+
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    assert second == pytest.approx({k: float(v) for k, v in first.items()})
+
+def test_feature_cache_evicts_least_recently_used(tmp_path):
+    cache = FeatureCache(tmp_path / "cache", max_bytes=140)
+    cache.put("a", {}, {'x': 1.0, 'padding': 'a' * 40})
+    cache.put("b", {}, {'x': 2.0, 'padding': 'b' * 40})
+    cache.get("a", {})
+    cache.put("c", {}, {'x': 3.0, 'padding': 'c' * 40})
+
+    assert cache.get("b", {}) is None
+    assert cache.get("a", {})['x'] == 1.0
+    assert cache.get("c", {})['x'] == 3.0
+
+def test_feature_cache_evicts_file_hashes(tmp_path):
+    cache = FeatureCache(tmp_path / "cache", max_bytes=1000)
+    kept = tmp_path / "kept.wav"
+    kept.write_bytes(b"audio")
+    cache.remember_file(kept, "h" * 32)
+
+    # Each upload is a new path; their hashes must not pile up past max_bytes
+    for i in range(100):
+        upload = tmp_path / f"upload_{i}.wav"
+        upload.write_bytes(b"audio")
+        cache.remember_file(upload, "u" * 32)
+        if i % 5 == 0:
+            assert cache.lookup_file(kept) == "h" * 32  # Recently used, so kept
+
+    assert cache.stats()['size_bytes'] <= 1000
+    assert cache.lookup_file(tmp_path / "upload_0.wav") is None
+    assert cache.lookup_file(tmp_path / "upload_99.wav") == "u" * 32
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(0).normal(size=(3, 1000))
+    stats = RunningStats()
+    for start in range(0, 1000, 128):
+        stats.update(values[:, start:start + 128])
+
+    np.testing.assert_allclose(stats.mean, values.mean(axis=1))
+    np.testing.assert_allclose(stats.std, values.std(axis=1))
+    np.testing.assert_allclose(stats.range, np.ptp(values, axis=1))
+
+@pytest.mark.parametrize("native_sr", [SR, 44100])
+def test_streaming_matches_in_memory_extraction(tmp_path, native_sr):
+    path = tmp_path / "long.wav"
+    sf.write(path, librosa.resample(np.tile(_voiced_tone(), 5), orig_sr=SR, target_sr=native_sr), native_sr)
+    analyzer = AcousticAnalyzer()
+
+    full = analyzer.extract_features(path)
+    streamed = analyzer.extract_features_streaming(path, block_seconds=3)
+
+    assert streamed['duration'] == pytest.approx(full['duration'])
+    for name in ['pitch_mean', 'spectral_centroid_mean', 'mfcc1_mean', 'mfcc2_std', 'rms_mean']:
+        assert streamed[name] == pytest.approx(full[name], rel=0.05)
+
+def test_resampled_blocks_keep_a_whole_number_of_hops(tmp_path):
+    path = tmp_path / "native.wav"
+    sf.write(path, librosa.resample(np.tile(_voiced_tone(), 3), orig_sr=SR, target_sr=44100), 44100)
+    block_frames = 512 * 20
+
+    blocks = list(read_mono_blocks(path, block_frames, SR))
+
+    assert {len(block) for block in blocks[:-1]} == {block_frames}
+    assert 0 < len(blocks[-1]) <= block_frames
+    assert sum(len(block) for block in blocks) == pytest.approx(6 * SR, abs=2)
+
+def test_session_decodes_once_for_features_and_visualizations(tone_path, tmp_path):
+    analyzer = AcousticAnalyzer()
+    calls = []
+    original_loader = analyzer.load_audio
+    analyzer.load_audio = lambda path: calls.append(path) or original_loader(path)
+
+    session = analyzer.open_session(tone_path)
+    analyzer.extract_features(tone_path, session=session)
+    plot_path = analyzer.generate_visualizations(tone_path, output_dir=tmp_path, session=session)
+
+    assert len(calls) == 1
+    assert Path(plot_path).exists()
+
+def test_resolve_feature_groups_adds_dependencies():
+    assert resolve_feature_groups('harmonic_ratio') == ['spectral_flatness', 'harmonic_ratio']
+    assert resolve_feature_groups(['pitch_mean', 'rms']) == ['pitch', 'rms']
+    with pytest.raises(ValueError):
+        resolve_feature_groups('not_a_feature')
+
+def test_cognitive_indicators_only_compute_cognitive_set(tone_path):
+    analyzer = AcousticAnalyzer()
+    indicators = analyzer.get_cognitive_indicators(tone_path)
+
+    assert set(indicators) == {'vocal_stability', 'articulation_precision', 'rhythm_regularity',
+                               'voice_quality', 'energy_variability'}
+    assert 'mfcc1_mean' not in analyzer.features
+    assert 'tempo' not in analyzer.features
+
+def test_ingest_resamples_once_to_analysis_rate(tmp_path, monkeypatch):
+    path = tmp_path / "tone_44k.wav"
+    sf.write(path, _voiced_tone(sr=44100), 44100)
+    ingest = AudioIngest(sample_rate=SR, resampler='soxr_qq', cache_dir=tmp_path / "decoded")
+
+    y, sr = ingest.load(path)
+    assert sr == SR and y.dtype == np.float32
+    assert len(y) == pytest.approx(2.0 * SR, abs=2)
+    assert len(list((tmp_path / "decoded").glob("*.npy"))) == 1
+
+    cached_y, cached_sr = ingest.load(path)
+    assert cached_sr == SR
+    np.testing.assert_array_equal(cached_y, y)
+
+    # Without a cache_dir nothing is written
+    monkeypatch.chdir(tmp_path / "decoded")
+    AudioIngest(sample_rate=SR).load(path)
+    assert len(list((tmp_path / "decoded").rglob("*.npy"))) == 1
+
+    with pytest.raises(ValueError):
+        AudioIngest(resampler='nearest')
@@ -0,0 +1,107 @@
+import sys
+import threading
+import numpy as np
+import pytest
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+sr = pytest.importorskip("speech_recognition")
+
+from src.data_processing.transcription import (FixtureBackend, Transcriber, TranscriptionBackend,
+                                               get_transcription_backend, to_audio_data)
+from src.data_processing.feature_cache import FeatureCache
+
+SR = 16000
+
+def _segments(n=6):
+    rng = np.random.default_rng(0)
+    return [to_audio_data(rng.uniform(-0.5, 0.5, SR // 10), SR) for _ in range(n)]
+
+class _CountingBackend(TranscriptionBackend):
+    name = 'counting'
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio_data):
+        self.calls += 1
+        return "hello"
+
+class _LastFirstBackend(FixtureBackend):
+    """Fixture backend whose segments finish last to first
+
+    Each segment waits for the one after it, so the call only completes when
+    every segment is in flight at once.
+    """
+
+    def __init__(self, fixtures):
+        super().__init__(fixtures)
+        self.index = {key: i for i, key in enumerate(fixtures)}
+        self.finished = [threading.Event() for _ in fixtures]
+        self.finish_order = []
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_data):
+        i = self.index[self.audio_key(audio_data)]
+        with self._lock:
+            self.calls += 1
+        if i + 1 < len(self.finished) and not self.finished[i + 1].wait(timeout=5):
+            raise RuntimeError("segments were not transcribed concurrently")
+        with self._lock:
+            self.finish_order.append(i)
+        self.finished[i].set()
+        return super().transcribe(audio_data)
+
+def test_to_audio_data_is_int16_pcm():
+    audio_data = to_audio_data(np.array([0.0, 0.5, -1.0, 2.0], dtype=np.float32), SR)
+    pcm = np.frombuffer(audio_data.get_raw_data(), dtype='<i2')
+    np.testing.assert_array_equal(pcm, [0, 16383, -32767, 32767])
+    assert audio_data.sample_width == 2
+
+def test_fixture_backend_is_deterministic():
+    segments = _segments(2)
+    backend = FixtureBackend({FixtureBackend.audio_key(segments[0]): "first"}, default="?")
+    assert backend.transcribe(segments[0]) == "first"
+    assert backend.transcribe(segments[1]) == "?"
+
+def test_transcribe_many_is_parallel_and_ordered():
+    segments = _segments(8)
+    fixtures = {FixtureBackend.audio_key(s): f"segment {i}" for i, s in enumerate(segments)}
+    backend = _LastFirstBackend(fixtures)
+
+    transcripts = Transcriber(backend, max_workers=8).transcribe_many(segments)
+
+    assert transcripts == [f"segment {i}" for i in range(8)]
+    assert backend.finish_order == list(range(7, -1, -1))
+    assert backend.calls == 8
+
+def test_transcribe_many_sequential_calls_once_per_segment():
+    backend = _CountingBackend()
+    assert Transcriber(backend, max_workers=1).transcribe_many(_segments(3)) == ["hello"] * 3
+    assert backend.calls == 3
+
+def test_segment_results_are_cached(tmp_path):
+    backend = _CountingBackend()
+    transcriber = Transcriber(backend, cache=FeatureCache(tmp_path, namespace='transcripts'))
+    segment = _segments(1)[0]
+
+    assert transcriber.transcribe(segment) == "hello"
+    assert transcriber.transcribe(segment) == "hello"
+    assert backend.calls == 1
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        get_transcription_backend('nope')
+
+def test_request_errors_are_raised_on_request():
+    class _OfflineBackend(TranscriptionBackend):
+        def transcribe(self, audio_data):
+            raise sr.RequestError("network unreachable")
+
+    segment = _segments(1)[0]
+    assert Transcriber(_OfflineBackend()).transcribe(segment) == ""
+    with pytest.raises(sr.RequestError):
+        Transcriber(_OfflineBackend(), raise_request_errors=True).transcribe(segment)
@@ -0,0 +1,13 @@
+import pytest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Modules copied verbatim between the two pipelines
+VENDORED_MODULES = ['feature_cache.py', 'transcription.py']
+
+@pytest.mark.parametrize("module", VENDORED_MODULES)
+def test_vendored_copies_are_identical(module):
+    main_copy = (ROOT / "src" / "data_processing" / module).read_text()
+    speech_copy = (ROOT / "speech_intelligence" / "src" / module).read_text()
+    assert main_copy == speech_copy, f"{module} differs between src/data_processing and speech_intelligence/src"
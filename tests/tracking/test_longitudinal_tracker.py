@@ -0,0 +1,334 @@
+import json
+import sys
+import threading
+import pytest
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.tracking.longitudinal_tracker import LongitudinalTracker
+from src.tracking.deviations import score_deviations
+
+@pytest.fixture
+def tracker(tmp_path):
+    with LongitudinalTracker(tmp_path / "tracking.db") as tracker:
+        yield tracker
+
+def _store_series(tracker, user_id, values, feature='speech_rate_wpm'):
+    for i, value in enumerate(values):
+        tracker.store_assessment(user_id, {feature: value}, risk_score=0.2,
+                                 assessment_id=f"{user_id}_{i}")
+
+def test_connection_is_persistent_and_configured(tracker):
+    conn = tracker.db.connection()
+    assert tracker.db.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+def test_baseline_and_alerts(tracker):
+    tracker.register_user("u1", name="Test")
+    _store_series(tracker, "u1", [120, 122, 118, 121, 60])
+
+    baselines = tracker.get_user_baselines("u1")
+    assert list(baselines['feature_name']) == ['speech_rate_wpm']
+
+    alerts = tracker.get_alerts("u1")
+    assert len(alerts) == 1
+    tracker.mark_alert_reviewed(int(alerts['alert_id'][0]))
+    assert tracker.get_alerts("u1", unreviewed_only=True).empty
+
+def test_failed_transaction_rolls_back(tracker):
+    tracker.register_user("u1")
+    with pytest.raises(RuntimeError):
+        with tracker.transaction() as conn:
+            conn.execute("INSERT INTO users (user_id) VALUES ('u2')")
+            raise RuntimeError
+    assert tracker.db.connection().execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+
+def test_concurrent_writers(tracker):
+    errors = []
+
+    def write(user_id):
+        try:
+            tracker.register_user(user_id)
+            _store_series(tracker, user_id, [1.0, 2.0, 3.0, 4.0])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(f"u{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    count = tracker.db.connection().execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
+    assert count == 32
+
+def test_migrations_record_version_and_index_hot_queries(tmp_path):
+    path = tmp_path / "tracking.db"
+    with LongitudinalTracker(path) as tracker:
+        assert tracker.db.schema_version() == len(tracker._migrations())
+
+        plan = " ".join(row[3] for row in tracker.db.connection().execute('''
+        EXPLAIN QUERY PLAN
+        SELECT feature_value FROM assessment_features af
+        JOIN assessments a ON af.assessment_id = a.assessment_id
+        WHERE a.user_id = ? AND feature_name = ?
+        ''', ("u1", "f")))
+        assert "idx_assessments_user_time" in plan
+        assert "SCAN af" not in plan
+
+    # Reopening an up-to-date database is a no-op
+    with LongitudinalTracker(path) as tracker:
+        assert tracker.db.schema_version() == len(tracker._migrations())
+
+def test_tracker_can_stop_at_an_older_schema_version(tmp_path):
+    path = tmp_path / "tracking.db"
+    with LongitudinalTracker(path, schema_version=1) as tracker:
+        assert tracker.db.schema_version() == 1
+        tables = {row[0] for row in tracker.db.connection().execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")}
+        assert 'assessments' in tables
+        assert not {'baseline_windows', 'feature_vectors', 'idx_assessments_user_time'} & tables
+
+    with LongitudinalTracker(path) as tracker:
+        assert tracker.db.schema_version() == len(tracker._migrations())
+
+def test_incremental_windows_match_rebuild(tracker):
+    tracker.register_user("u1")
+    _store_series(tracker, "u1", [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+    conn = tracker.db.connection()
+
+    window = conn.execute("SELECT window_values FROM baseline_windows WHERE user_id = 'u1'").fetchone()[0]
+    assert json.loads(window) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert tracker._load_recent_values(conn.cursor(), "u1") == {("u1", "speech_rate_wpm"): json.loads(window)}
+
+    baseline = tracker.get_user_baselines("u1").iloc[0]
+    assert baseline['baseline_value'] == 5.0
+
+def test_window_migration_backfills_existing_data(tmp_path):
+    path = tmp_path / "tracking.db"
+    with LongitudinalTracker(path) as tracker:
+        _store_series(tracker, "u1", [1.0, 2.0, 3.0])
+        with tracker.transaction() as conn:
+            conn.execute("DROP TABLE baseline_windows")
+            conn.execute("PRAGMA user_version = 2")
+
+    with LongitudinalTracker(path) as tracker:
+        window = tracker.db.connection().execute("SELECT window_values FROM baseline_windows").fetchone()[0]
+        assert json.loads(window) == [1.0, 2.0, 3.0]
+
+def test_baseline_compaction_keeps_latest_row(tmp_path):
+    path = tmp_path / "tracking.db"
+    with LongitudinalTracker(path) as tracker:
+        with tracker.transaction() as conn:
+            # Recreate the version 3 table, which accumulated a row per assessment
+            conn.execute("DROP TABLE user_baselines")
+            tracker._create_schema(conn.cursor())
+            conn.executemany('''
+            INSERT INTO user_baselines (user_id, feature_name, baseline_value, upper_threshold, lower_threshold)
+            VALUES (?, ?, ?, ?, ?)
+            ''', [("u1", "f", v, v + 1, v - 1) for v in (1.0, 2.0)] + [("u1", "g", 5.0, 6.0, 4.0), ("u1", "f", 3.0, 4.0, 2.0)])
+            conn.execute("PRAGMA user_version = 3")
+
+    with LongitudinalTracker(path) as tracker:
+        baselines = tracker.get_user_baselines("u1").set_index('feature_name')['baseline_value']
+        assert baselines.to_dict() == {"f": 3.0, "g": 5.0}
+
+        _store_series(tracker, "u1", [1.0, 2.0, 3.0, 4.0], feature="f")
+        assert len(tracker.get_user_baselines("u1")) == 2
+
+def test_packed_layout_matches_rows(tmp_path):
+    series = [{"speech_rate_wpm": 120.0, "hesitation_ratio": 0.25, "label": "x"},
+              {"hesitation_ratio": 0.5},
+              {"speech_rate_wpm": 118.0, "pause_count": 3, "hesitation_ratio": 0.25},
+              {"speech_rate_wpm": 60.0, "hesitation_ratio": 0.75}]
+    results = {}
+    for layout in ('rows', 'packed'):
+        with LongitudinalTracker(tmp_path / f"{layout}.db", feature_storage=layout) as tracker:
+            for i, features in enumerate(series):
+                tracker.store_assessment("u1", features, risk_score=0.2, assessment_id=f"u1_{i}")
+            results[layout] = [
+                tracker.get_user_history("u1").drop(columns='timestamp'),
+                tracker.get_user_history("u1", wide=True).drop(columns='timestamp'),
+                tracker.get_user_history("u1", ["pause_count"], wide=True).drop(columns='timestamp'),
+                tracker.get_user_baselines("u1").drop(columns='last_updated'),
+            ]
+
+    for rows_df, packed_df in zip(results['rows'], results['packed']):
+        pd.testing.assert_frame_equal(rows_df, packed_df, check_dtype=False)
+    assert list(results['packed'][1]['assessment_id']) == ["u1_0", "u1_1", "u1_2", "u1_3"]
+    assert list(results['packed'][2]['assessment_id']) == ["u1_2"]
+
+def test_packed_vectors_one_row_per_assessment(tmp_path):
+    with LongitudinalTracker(tmp_path / "tracking.db", feature_storage='packed') as tracker:
+        _store_series(tracker, "u1", [1.0, 2.0, 3.0])
+        tracker.store_assessment("u1", {"speech_rate_wpm": 4.0, "pause_count": 2}, risk_score=0.2)
+        conn = tracker.db.connection()
+        assert conn.execute("SELECT COUNT(*) FROM feature_vectors").fetchone()[0] == 4
+        assert conn.execute("SELECT COUNT(*) FROM assessment_features").fetchone()[0] == 0
+
+        windows = tracker._load_recent_values(conn.cursor(), "u1")
+        assert windows == {("u1", "speech_rate_wpm"): [1.0, 2.0, 3.0, 4.0], ("u1", "pause_count"): [2.0]}
+
+    with pytest.raises(ValueError):
+        LongitudinalTracker(tmp_path / "tracking.db")
+
+def test_bulk_import_matches_sequential_stores(tmp_path):
+    values = [120.0, 122.0, 118.0, 121.0, 60.0]
+    with LongitudinalTracker(tmp_path / "sequential.db") as tracker:
+        _store_series(tracker, "u1", values)
+        expected = tracker.get_user_baselines("u1").drop(columns='last_updated')
+
+    consumed = []
+    def records():
+        for i, value in enumerate(values):
+            consumed.append(i)
+            yield {"user_id": "u1", "features": {"speech_rate_wpm": value}, "risk_score": 0.2,
+                   "assessment_id": f"u1_{i}", "timestamp": f"2024-01-0{i + 1}T09:00:00"}
+
+    with LongitudinalTracker(tmp_path / "bulk.db") as tracker:
+        assert tracker.store_assessments_bulk(records(), chunk_size=2) == 5
+        assert consumed == list(range(5))
+
+        pd.testing.assert_frame_equal(tracker.get_user_baselines("u1").drop(columns='last_updated'), expected)
+        # Only the latest assessment is checked, against the final baselines
+        alerts = tracker.get_alerts("u1", days=None)
+        assert list(alerts['assessment_id']) == ["u1_4"]
+        assert tracker.db.connection().execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+
+def test_bulk_import_generates_distinct_ids_for_shared_timestamps(tracker):
+    timestamps = ["2024-01-01T09:00:00", "2024-01-01T09:00:00",
+                  "2024-01-01T09:00:00.250000", "2024-01-01T09:00:00.750000"]
+    records = [{"user_id": "u1", "features": {"speech_rate_wpm": 120.0 + i}, "risk_score": 0.2,
+                "timestamp": timestamp} for i, timestamp in enumerate(timestamps)]
+
+    assert tracker.store_assessments_bulk(records) == 4
+    # Generated ids are deterministic, so importing the same records again adds nothing
+    assert tracker.store_assessments_bulk(records) == 0
+    assert tracker.db.connection().execute("SELECT COUNT(*) FROM assessments").fetchone()[0] == 4
+
+def test_bulk_import_resumes_after_partial_failure(tmp_path):
+    values = [120.0, 122.0, 118.0, 121.0, 60.0]
+    records = [{"user_id": "u1", "features": {"speech_rate_wpm": value}, "risk_score": 0.2,
+                "assessment_id": f"u1_{i}", "timestamp": f"2024-01-0{i + 1}T09:00:00"}
+               for i, value in enumerate(values)]
+
+    def failing_after(n):
+        yield from records[:n]
+        raise ValueError("corrupt record")
+
+    with LongitudinalTracker(tmp_path / "tracking.db") as tracker:
+        with pytest.raises(ValueError):
+            tracker.store_assessments_bulk(failing_after(4), chunk_size=2)
+        # Both committed chunks are stored and already shape the baselines
+        baselines = tracker.get_user_baselines("u1")
+        assert baselines['baseline_value'].tolist() == [pytest.approx(120.5)]
+
+        assert tracker.store_assessments_bulk(records, chunk_size=2) == 1
+        baselines = tracker.get_user_baselines("u1").drop(columns='last_updated')
+
+    with LongitudinalTracker(tmp_path / "single.db") as tracker:
+        tracker.store_assessments_bulk(records)
+        pd.testing.assert_frame_equal(tracker.get_user_baselines("u1").drop(columns='last_updated'),
+                                      baselines)
+
+def test_score_deviations_matches_thresholds():
+    # Baseline 10 with a standard deviation of 1 (thresholds at +/- 2 std)
+    values = [[10.0, 11.6, 7.9, 13.5], [float('nan'), 10.0, 12.5, 5.0]]
+    deviation, severity = score_deviations(values, 10.0, 12.0, 8.0)
+    assert severity.tolist() == [[0, 1, 2, 3], [0, 0, 2, 3]]
+    assert deviation[0, 2] == pytest.approx(-2.1)
+
+    # No spread, no alerts
+    assert score_deviations([5.0], 1.0, 1.0, 1.0)[1].tolist() == [0]
+
+def test_backfill_alerts_replays_live_checks(tmp_path):
+    rates = [100, 120, 121, 119, 120, 122, 60, 121, 150, 119]
+    pauses = [2, 3, None, 2, 9, None, 3, 2, 3, 8]
+    series = []
+    for rate, pause in zip(rates, pauses):
+        features = {"speech_rate_wpm": float(rate)}
+        if pause is not None:
+            features["pause_count"] = float(pause)
+        series.append(features)
+
+    def alert_rows(tracker):
+        alerts = tracker.get_alerts("u1", days=None)
+        return sorted(zip(alerts['assessment_id'], alerts['feature_name'], alerts['severity'],
+                          alerts['deviation_value'].round(9)))
+
+    with LongitudinalTracker(tmp_path / "live.db") as tracker:
+        tracker.register_user("u1")
+        for i, features in enumerate(series):
+            tracker.store_assessment("u1", features, risk_score=0.2, assessment_id=f"u1_{i}")
+        live = alert_rows(tracker)
+        # Live alerts are exactly what a backfill finds, so nothing is added
+        assert tracker.backfill_alerts() == 0
+
+    # The first assessments precede any baseline and never alert
+    assert live and all(assessment_id not in ("u1_0", "u1_1") for assessment_id, *_ in live)
+
+    with LongitudinalTracker(tmp_path / "imported.db") as tracker:
+        tracker.store_assessments_bulk(
+            ({"user_id": "u1", "features": features, "risk_score": 0.2, "assessment_id": f"u1_{i}",
+              "timestamp": f"2024-01-{i + 1:02d}T09:00:00"} for i, features in enumerate(series)),
+            check_deviations=False)
+        assert tracker.backfill_alerts() == len(live)
+        assert alert_rows(tracker) == live
+        assert tracker.backfill_alerts(["u1"]) == 0
+
+def test_failed_store_does_not_leak_feature_positions(tmp_path):
+    with LongitudinalTracker(tmp_path / "tracking.db", feature_storage='packed') as tracker:
+        tracker.store_assessment("u1", {"a": 1.0}, risk_score=0.2, assessment_id="u1_0")
+        with pytest.raises(OverflowError):
+            tracker.store_assessment("u1", {"c": 10 ** 400}, risk_score=0.2, assessment_id="u1_1")
+        tracker.store_assessment("u1", {"c": 5.0}, risk_score=0.2, assessment_id="u1_2")
+        tracker.store_assessment("u1", {"d": 6.0}, risk_score=0.2, assessment_id="u1_3")
+
+        history = tracker.get_user_history("u1")
+        assert list(zip(history['feature_name'], history['feature_value'])) == [
+            ("a", 1.0), ("c", 5.0), ("d", 6.0)]
+
+def test_trend_report_plots_risk_score_once(tracker, tmp_path, monkeypatch):
+    import matplotlib.pyplot as plt
+    tracker.register_user("u1", name="Test")
+    _store_series(tracker, "u1", [120, 122, 118])
+    _store_series(tracker, "u2", [0.1, 0.2], feature='hesitation_ratio')
+
+    titles = []
+    savefig = plt.savefig
+    def record_titles(*args, **kwargs):
+        titles.extend(ax.get_title() for ax in plt.gcf().axes)
+        savefig(*args, **kwargs)
+    monkeypatch.setattr(plt, 'savefig', record_titles)
+
+    assert Path(tracker.generate_trend_report("u1", output_path=tmp_path)).exists()
+    assert titles == ["Cognitive Risk Score Trend - Test", "Speech Rate Wpm"]
+
+@pytest.mark.parametrize("layout", ['rows', 'packed'])
+def test_backfill_alerts_covers_tracked_risk_score(tmp_path, layout):
+    # VoiceAnalyzer tracks risk_score as a feature besides the assessment column
+    risks = [0.20, 0.22, 0.21, 0.20, 0.80, 0.21]
+    with LongitudinalTracker(tmp_path / "tracking.db", feature_storage=layout) as tracker:
+        tracker.register_user("u1")
+        for i, risk in enumerate(risks):
+            tracker.store_assessment("u1", {"risk_score": risk, "speech_rate_wpm": 120.0},
+                                     risk_score=risk, assessment_id=f"u1_{i}")
+        live = tracker.get_alerts("u1", days=None)
+        assert list(zip(live['assessment_id'], live['feature_name'])) == [("u1_4", "risk_score")]
+
+        tracker.db.connection().execute("DELETE FROM alerts")
+        assert tracker.backfill_alerts() == 1
+        backfilled = tracker.get_alerts("u1", days=None)
+        assert backfilled[['assessment_id', 'feature_name', 'severity']].equals(
+            live[['assessment_id', 'feature_name', 'severity']])
+        assert backfilled['deviation_value'].tolist() == pytest.approx(live['deviation_value'].tolist())
+
+        # The wide history still only has risk_score as the assessment column
+        history = tracker.get_user_history("u1", wide=True)
+        assert list(history.columns) == ['assessment_id', 'timestamp', 'task_type', 'risk_score',
+                                         'speech_rate_wpm']
@@ -23,6 +23,9 @@ sys.path.append(str(Path(__file__).resolve().parent))
 # Import project modules
 from src.data_processing.feature_extractor import FeatureExtractor
 from src.data_processing.acoustic_analyzer import AcousticAnalyzer
+from src.data_processing.audio_ingest import DEFAULT_DECODED_CACHE_DIR
+from src.data_processing.feature_cache import FeatureCache
+from src.data_processing.transcription import Transcriber
 from src.models.unsupervised_analyzer import UnsupervisedAnalyzer
 from src.visualization.visualizer import Visualizer
 from src.tracking.longitudinal_tracker import LongitudinalTracker
@@ -30,8 +33,9 @@ from src.tracking.longitudinal_tracker import LongitudinalTracker
 class VoiceAnalyzer:
     """Records and analyzes speech in real time for cognitive markers"""
     
-    def __init__(self):
+    def __init__(self, transcription_backend='google'):
         self.recognizer = sr.Recognizer()
+        self.transcriber = Transcriber(transcription_backend, cache=FeatureCache(namespace='transcripts'))
         self.audio_format = pyaudio.paInt16
         self.channels = 1
         self.sample_rate = 44100
@@ -52,7 +56,8 @@ class VoiceAnalyzer:
         
         # Initialize analyzers
         self.feature_extractor = FeatureExtractor()
-        self.acoustic_analyzer = AcousticAnalyzer()
+        self.acoustic_analyzer = AcousticAnalyzer(cache=FeatureCache(),
+                                                  decoded_cache_dir=DEFAULT_DECODED_CACHE_DIR)
         self.tracker = LongitudinalTracker()  # Initialize the longitudinal tracker
         
         # Hesitation markers
@@ -144,18 +149,12 @@ class VoiceAnalyzer:
         
         with sr.AudioFile(audio_path) as source:
             audio_data = self.recognizer.record(source)
-            
-            try:
-                # Use Google's speech recognition (requires internet)
-                transcript = self.recognizer.recognize_google(audio_data)
-                print("Transcript: " + transcript)
-                return transcript
-            except sr.UnknownValueError:
-                print("Speech recognition could not understand audio")
-                return ""
-            except sr.RequestError as e:
-                print(f"Could not request results from speech recognition service; {e}")
-                return ""
+        
+        # Backend errors are reported by the transcriber and yield ""
+        transcript = self.transcriber.transcribe(audio_data)
+        if transcript:
+            print("Transcript: " + transcript)
+        return transcript
     
     # New methods for longitudinal tracking
     def set_user(self, user_id=None, name=None, age=None, gender=None, notes=None):
@@ -257,11 +256,13 @@ class VoiceAnalyzer:
         acoustic_features = {}
         acoustic_indicators = {}
         if audio_path:
-            acoustic_features = self.acoustic_analyzer.extract_features(audio_path)
+            # One session: the clip is decoded and transformed once for features and plots
+            session = self.acoustic_analyzer.open_session(audio_path)
+            acoustic_features = self.acoustic_analyzer.extract_features(audio_path, session=session)
             acoustic_indicators = self.acoustic_analyzer.get_cognitive_indicators()
             
             # Generate acoustic visualizations
-            viz_path = self.acoustic_analyzer.generate_visualizations(audio_path)
+            viz_path = self.acoustic_analyzer.generate_visualizations(audio_path, session=session)
             print(f"Acoustic analysis visualizations saved to: {viz_path}")
         
         # Combine all features